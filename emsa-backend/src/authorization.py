@@ -1,37 +1,47 @@
-from datetime import datetime, timedelta
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Annotated, Any
+from uuid import uuid4
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JOSEError, JWTError, jwt
 from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
-from werkzeug.security import check_password_hash, generate_password_hash
 
 from src.crud.user import UserCRUD
 from src.database.schemas import PrivateUser, PublicUser, TokenData
 from src.database.session import get_db
-from src.exceptions import IncorrectUsernameOrPassword
+from src.exceptions import IncorrectUsernameOrPassword, InvalidRefreshToken
+from src.services.password_hasher import (
+    check_password,
+    hash_password,
+    password_hasher,
+)
+from src.services.revocation_set import revocation_set
+from src.services.token_cache import hash_token, token_cache
 from src.settings import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
 def verify_password(hashed_password: str, plain_password: str):
-    return check_password_hash(pwhash=hashed_password, password=plain_password)
+    return check_password(hashed_password, plain_password)
 
 
 def get_password_hash(password: str):
-    return generate_password_hash(password)
+    return hash_password(password, settings.PASSWORD_HASH_METHOD)
 
 
 async def authenticate_user(
     mail: EmailStr, password: str, db: AsyncSession
 ) -> PrivateUser:
-    user = await UserCRUD.get_user(mail, db)
-    if not user:
+    try:
+        user = await UserCRUD.get_user(mail, db)
+    except ValueError:
         raise IncorrectUsernameOrPassword
-    if not verify_password(user.password_hash, password):
+    if not await password_hasher.verify(user.password_hash, password):
         raise IncorrectUsernameOrPassword
     return user
 
@@ -45,16 +55,46 @@ async def create_access_token(
     else:
         expire = datetime.now() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
+    if settings.AUTH_STATELESS:
+        to_encode.update({"jti": uuid4().hex})
     encoded_jwt = jwt.encode(
         to_encode,
         key=settings.AUTH_SECRET_KEY,
         algorithm=settings.AUTH_ALGORITHM,
     )
 
-    token = await UserCRUD.create_token(encoded_jwt, db)
+    token = await UserCRUD.create_token(encoded_jwt, db, user_mail=data["sub"])
     return token.access_token
 
 
+def _refresh_token_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(
+        days=settings.AUTH_REFRESH_TOKEN_EXPIRE_DAYS
+    )
+
+
+async def create_refresh_token(user_mail: EmailStr, db: AsyncSession) -> str:
+    refresh_token = secrets.token_urlsafe(48)
+    await UserCRUD.create_refresh_token(
+        user_mail, hash_token(refresh_token), _refresh_token_expiry(), db
+    )
+    return refresh_token
+
+
+async def rotate_refresh_token(refresh_token: str, db: AsyncSession) -> tuple[str, str]:
+    """Consumes a refresh token and returns its owner with a replacement token."""
+    new_refresh_token = secrets.token_urlsafe(48)
+    user_mail = await UserCRUD.rotate_refresh_token(
+        hash_token(refresh_token),
+        hash_token(new_refresh_token),
+        _refresh_token_expiry(),
+        db,
+    )
+    if user_mail is None:
+        raise InvalidRefreshToken
+    return user_mail, new_refresh_token
+
+
 def decode_jwt_token(token: str) -> dict[str, Any]:
     try:
         return jwt.decode(
@@ -64,6 +104,14 @@ def decode_jwt_token(token: str) -> dict[str, Any]:
         raise JWTError("Invalid credentials")
 
 
+async def is_token_revoked(jti: str, db: AsyncSession) -> bool:
+    if revocation_set.needs_refresh():
+        revocation_set.mark_refreshed()
+        read_at = time.monotonic()
+        revocation_set.replace(await UserCRUD.get_revoked_tokens(db), read_at)
+    return revocation_set.is_revoked(jti)
+
+
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: AsyncSession = Depends(get_db),
@@ -77,25 +125,42 @@ async def get_current_user(
         payload = jwt.decode(
             token, key=settings.AUTH_SECRET_KEY, algorithms=[settings.AUTH_ALGORITHM]
         )
-        user_mail: str = payload.get("sub")
-        if not user_mail:
-            raise credentials_exception
-        token_data = TokenData(user_mail=user_mail)
     except JWTError:
         raise credentials_exception
+
+    if settings.AUTH_STATELESS:
+        # signed tokens are trusted, only a revoked jti can reject them
+        jti = payload.get("jti")
+        if not jti or await is_token_revoked(jti, db):
+            raise credentials_exception
+
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        UserCRUD.prime_user(cached_user, db)
+        return cached_user
+
+    user_mail: str = payload.get("sub")
+    if not user_mail:
+        raise credentials_exception
+    cache_generation = token_cache.generation(user_mail)
     try:
-        user = await UserCRUD.get_user(token_data.user_mail, db)
+        token_data = TokenData(user_mail=user_mail)
     except ValueError:
         raise credentials_exception
 
-    db_token = await UserCRUD.get_token(user.mail, db)
-    if (
-        db_token is None
-        or not (db_token.is_active if db_token else False)
-        or db_token.access_token != token
-    ):
-        raise credentials_exception
+    if settings.AUTH_STATELESS:
+        try:
+            user = await UserCRUD.get_user(token_data.user_mail, db)
+        except ValueError:
+            raise credentials_exception
+    else:
+        active_user = await UserCRUD.get_user_by_token(token_data.user_mail, token, db)
+        if active_user is None:
+            raise credentials_exception
+        user = active_user
+        UserCRUD.prime_user(user, db)
 
+    token_cache.set(token, user, payload.get("exp"), cache_generation)
     return user
 
 
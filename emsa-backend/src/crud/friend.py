@@ -2,7 +2,7 @@ from pydantic import EmailStr
 from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.crud.validators import validate_not_self, validate_user_exist
+from src.crud.validators import validate_not_self, validate_users_exist
 from src.database.models import FriendRequest, Friendship, User
 from src.database.schemas import (
     FriendRequestCreate,
@@ -46,8 +46,7 @@ class FriendCRUD:
         db: AsyncSession,
     ) -> FriendRequestGet:
         validate_not_self(sender_mail, receiver_mail)
-        await validate_user_exist(sender_mail, db)
-        await validate_user_exist(receiver_mail, db)
+        await validate_users_exist([sender_mail, receiver_mail], db)
         if await FriendCRUD.check_if_friends(sender_mail, receiver_mail, db):
             raise ValueError("Users are already friends")
 
@@ -120,8 +119,7 @@ class FriendCRUD:
         db: AsyncSession,
     ) -> None:
         validate_not_self(sender_mail, receiver_mail)
-        await validate_user_exist(sender_mail, db)
-        await validate_user_exist(receiver_mail, db)
+        await validate_users_exist([sender_mail, receiver_mail], db)
         existing_request_query = select(FriendRequest).where(
             FriendRequest.sender_mail == sender_mail,
             FriendRequest.receiver_mail == receiver_mail,
@@ -152,8 +150,7 @@ class FriendCRUD:
         user_mail: EmailStr, friend_mail: EmailStr, db: AsyncSession
     ) -> None:
         validate_not_self(user_mail, friend_mail)
-        await validate_user_exist(user_mail, db)
-        await validate_user_exist(friend_mail, db)
+        await validate_users_exist([user_mail, friend_mail], db)
         if await FriendCRUD.check_if_friends(user_mail, friend_mail, db):
             raise ValueError("Users are already friends")
 
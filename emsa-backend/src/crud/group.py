@@ -1,12 +1,25 @@
 import logging
+from functools import partial
 
 from pydantic import EmailStr
-from sqlalchemy import delete, exists, insert, select, update
+from sqlalchemy import delete, exists, insert, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from src.crud.tag import TagCRUD
 from src.crud.user import UserCRUD
+from src.database.hooks import after_commit
+from src.database.loader import BatchLoader, get_loader
 from src.database.models import Group, Media, User, user_group_association
-from src.database.schemas import GroupCreate, GroupGet, GroupUpdate, PublicUser
+from src.database.schemas import (
+    GroupCreate,
+    GroupGet,
+    GroupUpdate,
+    PrivateUser,
+    PublicUser,
+)
+from src.services.search_cache import search_cache
+from src.services.search_index import search_index
 
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
@@ -32,15 +45,29 @@ class GroupCRUD:
 
     @staticmethod
     async def get_group(group_id: int, db: AsyncSession) -> GroupGet:
-        query = select(Group).where(Group.id == group_id)
-        result = await db.execute(query)
-        group_data = result.fetchone()
+        loader = GroupCRUD._group_loader(db)
+        if loader is not None:
+            group = await loader.load(group_id)
+        else:
+            group = (await GroupCRUD._get_groups_by_id([group_id], db)).get(group_id)
 
-        if group_data:
-            return GroupGet(**group_data[0].to_dict())
+        if group:
+            return group
         else:
             raise ValueError(f"No group found with ID: {group_id}")
 
+    @staticmethod
+    def _group_loader(db: AsyncSession) -> BatchLoader | None:
+        return get_loader(db, "groups", GroupCRUD._get_groups_by_id)
+
+    @staticmethod
+    async def _get_groups_by_id(
+        group_ids: list[int], db: AsyncSession
+    ) -> dict[int, GroupGet]:
+        query = select(Group).where(Group.id.in_(group_ids))
+        result = await db.execute(query)
+        return {group.id: GroupGet(**group.to_dict()) for group in result.scalars()}
+
     @staticmethod
     async def get_groups(db: AsyncSession) -> list[GroupGet]:
         query = select(Group)
@@ -64,12 +91,22 @@ class GroupCRUD:
         row = result.fetchone()
 
         if row:
-            return GroupGet(**row)
+            updated_group = GroupGet(**row)
+            loader = GroupCRUD._group_loader(db)
+            if loader is not None:
+                loader.prime(group_id, updated_group)
+            return updated_group
         else:
             raise ValueError(f"No group found with ID: {group_id}")
 
     @staticmethod
     async def delete_group(group_id: int, db: AsyncSession) -> None:
+        loader = GroupCRUD._group_loader(db)
+        if loader is not None:
+            loader.forget(group_id)
+        after_commit(db, partial(search_index.invalidate_group, group_id))
+        after_commit(db, partial(search_cache.invalidate_group, group_id))
+        await TagCRUD.delete_group_tags(group_id, db)
         await db.execute(delete(Media).where(Media.group_id == group_id))
         await db.execute(
             delete(user_group_association).where(
@@ -133,14 +170,48 @@ class GroupCRUD:
         groups = result.fetchall()
         return [GroupGet(**group[0].to_dict()) for group in groups]
 
+    @staticmethod
+    async def _get_group_and_user(
+        group_id: int, user_mail: str, db: AsyncSession
+    ) -> tuple[GroupGet | None, PrivateUser | None]:
+        """
+        Fetches a group and a user with a single statement, the two filtered
+        tables are full outer joined so either side may be missing. The
+        session's loaders are primed with what was found.
+        """
+        group_alias = aliased(
+            Group, select(Group).where(Group.id == group_id).subquery()
+        )
+        user_alias = aliased(
+            User, select(User).where(User.mail == user_mail).subquery()
+        )
+        query = select(group_alias, user_alias).join_from(
+            group_alias, user_alias, true(), full=True
+        )
+        row = (await db.execute(query)).first()
+        if row is None:
+            return None, None
+
+        group = GroupGet(**row[0].to_dict()) if row[0] is not None else None
+        user = PrivateUser(**row[1].to_dict()) if row[1] is not None else None
+        loader = GroupCRUD._group_loader(db)
+        if group is not None and loader is not None:
+            loader.prime(group.id, group)
+        if user is not None:
+            UserCRUD.prime_user(user, db)
+        return group, user
+
     @staticmethod
     async def remove_user_from_group(
         group_id: int,
         member_mail: str,
         db: AsyncSession,
     ) -> None:
-        await GroupCRUD.get_group(group_id, db)
-        await UserCRUD.get_user(member_mail, db)
+        group, user = await GroupCRUD._get_group_and_user(group_id, member_mail, db)
+        if group is None:
+            raise ValueError(f"No group found with ID: {group_id}")
+        if user is None:
+            raise ValueError(f"No user found with mail: {member_mail}")
 
         query = (
             delete(user_group_association)
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import LoginAttempt
+
+
+class LoginAttemptCRUD:
+    @staticmethod
+    async def lock_key(key: str, db: AsyncSession) -> None:
+        """Serializes the attempts on `key` until the end of the transaction."""
+        await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(key))))
+
+    @staticmethod
+    async def count_attempts(key: str, since: datetime, db: AsyncSession) -> int:
+        query = select(func.count(LoginAttempt.id)).where(
+            LoginAttempt.key == key, LoginAttempt.attempted_at > since
+        )
+        result = await db.execute(query)
+        return result.scalar() or 0
+
+    @staticmethod
+    async def add_attempt(key: str, db: AsyncSession) -> None:
+        await db.execute(insert(LoginAttempt).values(key=key))
+
+    @staticmethod
+    async def delete_attempts(key: str, before: datetime, db: AsyncSession) -> None:
+        await db.execute(
+            delete(LoginAttempt)
+            .where(LoginAttempt.key == key, LoginAttempt.attempted_at <= before)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def delete_expired_attempts(before: datetime, db: AsyncSession) -> None:
+        await db.execute(
+            delete(LoginAttempt)
+            .where(LoginAttempt.attempted_at <= before)
+            .execution_options(synchronize_session=False)
+        )
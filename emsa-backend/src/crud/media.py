@@ -1,16 +1,40 @@
-from fuzzywuzzy import fuzz
-from sqlalchemy import delete, insert, select, update
+import heapq
+from functools import partial
+from typing import Sequence
+
+import numpy as np
+from sqlalchemy import (
+    and_,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud.group import GroupCRUD
-from src.database.models import Media
+from src.crud.tag import TagCRUD
+from src.database.hooks import after_commit
+from src.database.models import Group, Media
+from src.database.pagination import decode_cursor, encode_cursor
 from src.database.schemas import (
     MediaCreate,
     MediaGet,
     MediaList,
+    MediaPage,
     MediaQuery,
+    MediaSearchResult,
     MediaUpdate,
 )
+from src.services.search_cache import search_cache
+from src.services.search_index import search_index
+from src.services.tag_scorer import TagTable, score_names
+from src.settings import settings
 
 
 class MediaCRUD:
@@ -21,7 +45,23 @@ class MediaCRUD:
         fetched_media = result.fetchone()
 
         if fetched_media:
-            return MediaGet(**fetched_media._asdict())
+            created_media = MediaGet(**fetched_media._asdict())
+            await TagCRUD.add_media_tags(
+                created_media.group_id, created_media.id, created_media.tags, db
+            )
+            after_commit(
+                db,
+                partial(
+                    search_index.add_media,
+                    created_media.group_id,
+                    created_media.id,
+                    created_media.tags,
+                ),
+            )
+            after_commit(
+                db, partial(search_cache.invalidate_group, created_media.group_id)
+            )
+            return created_media
         else:
             raise ValueError("Failed to create media. No row returned.")
 
@@ -57,39 +97,345 @@ class MediaCRUD:
         fetched_media = result.fetchone()
 
         if fetched_media:
-            return MediaGet(**fetched_media._asdict())
+            updated_media = MediaGet(**fetched_media._asdict())
+            after_commit(
+                db,
+                partial(
+                    search_index.add_media,
+                    updated_media.group_id,
+                    updated_media.id,
+                    updated_media.tags,
+                ),
+            )
+            after_commit(
+                db, partial(search_cache.invalidate_group, updated_media.group_id)
+            )
+            return updated_media
         else:
             raise ValueError(f"No media found with ID: {media_id}")
 
     @staticmethod
     async def delete_media_from_db(media_id: int, db: AsyncSession) -> None:
-        query = delete(Media).where(Media.id == media_id)
-        await db.execute(query)
+        await TagCRUD.remove_media_tags(media_id, db)
+        query = delete(Media).where(Media.id == media_id).returning(Media.group_id)
+        result = await db.execute(query)
+        group_id = result.scalar()
+        if group_id is not None:
+            after_commit(db, partial(search_index.remove_media, group_id, media_id))
+            after_commit(db, partial(search_cache.invalidate_group, group_id))
 
     @staticmethod
     async def get_media_by_group(
         group_id: int, db: AsyncSession, query_params: MediaQuery | None = None
     ) -> list[MediaGet]:
-        await GroupCRUD.get_group(group_id, db)
-        query = select(Media).where(Media.group_id == group_id)
+        if query_params and query_params.search_term:
+            return await MediaCRUD._search_group(group_id, query_params, db)
+
+        fields = query_params.fields if query_params else None
+        rows = await MediaCRUD._select_group_media(
+            group_id,
+            db,
+            fields,
+            order_by=(Media.created_at.desc(), Media.id.desc()),
+        )
+        return [MediaCRUD._to_media(row, fields) for row in rows]
+
+    @staticmethod
+    async def get_media_page(
+        group_id: int,
+        db: AsyncSession,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> MediaPage:
+        """
+        One page of the group's media, newest first. The page after it starts
+        at `next_cursor` and is read straight from the
+        (group_id, created_at, id) index, however deep it is.
+        """
+        if limit is None:
+            limit = settings.MEDIA_PAGE_SIZE
+        after = None
+        if cursor is not None:
+            created_at, media_id = decode_cursor(cursor)
+            after = tuple_(Media.created_at, Media.id) < tuple_(created_at, media_id)
+
+        rows = await MediaCRUD._select_group_media(
+            group_id,
+            db,
+            fields,
+            order_by=(Media.created_at.desc(), Media.id.desc()),
+            condition=after,
+            limit=limit + 1,
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].media_id)
+        return MediaPage(
+            items=[MediaCRUD._to_media(row, fields) for row in rows],
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    async def _select_group_media(
+        group_id: int,
+        db: AsyncSession,
+        fields: Sequence[str] | None = None,
+        order_by: Sequence = (),
+        condition=None,
+        limit: int | None = None,
+    ) -> list[Row]:
+        """
+        Media of the group, checking that the group exists in the same
+        statement: the groups row is outer joined with its media, so an empty
+        group still yields one row with NULL media columns. Every row carries
+        `media_id` and `created_at` followed by the full `Media` or the
+        requested columns only.
+        """
+        columns = [Media] if fields is None else [getattr(Media, f) for f in fields]
+        on = Media.group_id == Group.id
+        if condition is not None:
+            on = and_(on, condition)
+        query = (
+            select(
+                Group.id.label("group_exists"),
+                Media.id.label("media_id"),
+                Media.created_at,
+                *columns,
+            )
+            .outerjoin(Media, on)
+            .where(Group.id == group_id)
+            .order_by(*order_by)
+            .limit(limit)
+        )
         result = await db.execute(query)
-        media_data = result.fetchall()
+        rows = result.all()
+        if not rows:
+            raise ValueError(f"No group found with ID: {group_id}")
+        return [row for row in rows if row.media_id is not None]
 
-        if query_params and query_params.search_term:
-            search_term = query_params.search_term.lower()
-            similarity_threshold = 0.65  # TODO: Adjust the threshold if needed
-
-            query = select(Media).where(Media.group_id == group_id)
-            result = await db.execute(query)
-            media_data = result.fetchall()
-
-            media_data = [
-                media
-                for media in media_data
-                if any(
-                    fuzz.ratio(search_term, tag.lower()) / 100 >= similarity_threshold
-                    for tag in media[0].tags
+    @staticmethod
+    def _to_media(row: Row, fields: Sequence[str] | None) -> MediaGet:
+        if fields is None:
+            return MediaGet(**row.Media.to_dict())
+        # a projection only carries the requested fields
+        return MediaGet.model_construct(**dict(zip(fields, row[3:])))
+
+    @staticmethod
+    async def _search_group(
+        group_id: int, query_params: MediaQuery, db: AsyncSession
+    ) -> list[MediaSearchResult]:
+        """
+        Runs the configured search engine through the search cache. A miss
+        ranks everything up to the end of the requested page, so the following
+        pages of the same term are served from the cache as well.
+        """
+        search_term = query_params.search_term
+        offset = query_params.offset
+        top = None if query_params.limit is None else offset + query_params.limit
+
+        # a cached ranking implies the group existed, deleting it drops the
+        # ranking, so only a miss needs to look the group up
+        ranking = search_cache.get(group_id, search_term, top)
+        if ranking is not None:
+            return await MediaCRUD._get_ranked_media(group_id, ranking[offset:top], db)
+
+        generation = search_cache.generation
+        if settings.MEDIA_SEARCH_ENGINE == "postgres":
+            await GroupCRUD.get_group(group_id, db)
+            search = MediaCRUD.search_media
+        elif settings.MEDIA_SEARCH_ENGINE == "index":
+            await GroupCRUD.get_group(group_id, db)
+            search = MediaCRUD.search_media_indexed
+        else:
+            # checks the group in the statement fetching the media
+            search = MediaCRUD.search_media_scan
+        ranked = await search(group_id, search_term, db, limit=top)
+        search_cache.set(
+            group_id,
+            search_term,
+            [(media.id, media.score) for media in ranked],
+            complete=top is None or len(ranked) < top,
+            generation=generation,
+        )
+        return ranked[offset:]
+
+    @staticmethod
+    async def _get_ranked_media(
+        group_id: int, ranking: Sequence[tuple[int, float]], db: AsyncSession
+    ) -> list[MediaSearchResult]:
+        if not ranking:
+            return []
+        scores = dict(ranking)
+        query = select(Media).where(
+            Media.group_id == group_id, Media.id.in_(list(scores))
+        )
+        result = await db.execute(query)
+        media = {item.id: item for item in result.scalars()}
+        # media deleted by another worker since the ranking was cached is skipped
+        return [
+            MediaSearchResult(**media[media_id].to_dict(), score=score)
+            for media_id, score in ranking
+            if media_id in media
+        ]
+
+    @staticmethod
+    async def search_media_scan(
+        group_id: int,
+        search_term: str,
+        db: AsyncSession,
+        similarity_threshold: float | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[MediaSearchResult]:
+        """
+        Scores the tags of every media of the group, the default engine.
+        Raises ValueError when the group does not exist.
+        """
+        if similarity_threshold is None:
+            similarity_threshold = settings.MEDIA_SEARCH_THRESHOLD
+        search_term = search_term.lower()
+
+        rows = await MediaCRUD._select_group_media(group_id, db)
+        media_data = [row.Media for row in rows]
+
+        tag_table = TagTable([media.tags for media in media_data])
+        tag_scores = tag_table.best_scores(search_term)
+        positions = np.flatnonzero(tag_scores >= similarity_threshold)
+        return MediaCRUD._rank_media(
+            [media_data[position] for position in positions],
+            tag_scores[positions].tolist(),
+            search_term,
+            limit,
+            offset,
+        )
+
+    @staticmethod
+    def _rank_media(
+        media: Sequence[Media],
+        tag_scores: Sequence[float],
+        search_term: str,
+        limit: int | None,
+        offset: int,
+    ) -> list[MediaSearchResult]:
+        """
+        Orders matches by their best tag score plus the weighted name score,
+        newer media first on ties. Only the requested page is selected.
+        """
+        name_scores = score_names(search_term, [item.name for item in media])
+        scores = [
+            tag_score + settings.MEDIA_SEARCH_NAME_WEIGHT * name_score
+            for tag_score, name_score in zip(tag_scores, name_scores.tolist())
+        ]
+
+        def rank(position: int) -> tuple:
+            return scores[position], media[position].created_at, media[position].id
+
+        if limit is None:
+            positions = sorted(range(len(media)), key=rank, reverse=True)
+        else:
+            positions = heapq.nlargest(offset + limit, range(len(media)), key=rank)
+        return [
+            MediaSearchResult(**media[position].to_dict(), score=scores[position])
+            for position in positions[offset:]
+        ]
+
+    @staticmethod
+    async def search_media_indexed(
+        group_id: int,
+        search_term: str,
+        db: AsyncSession,
+        similarity_threshold: float | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[MediaSearchResult]:
+        """
+        Same matching as the python engine, but only the tags sharing an n-gram
+        with the term are scored and only the matching rows are fetched.
+        """
+        if similarity_threshold is None:
+            similarity_threshold = settings.MEDIA_SEARCH_THRESHOLD
+
+        index = search_index.get(group_id)
+        if index is None:
+            generation = search_index.generation
+            result = await db.execute(
+                select(Media.id, Media.tags).where(Media.group_id == group_id)
+            )
+            index = search_index.build(
+                group_id, result.fetchall(), generation=generation
+            )
+
+        tag_scores = index.score(search_term, similarity_threshold)
+        if not tag_scores:
+            return []
+        query = select(Media).where(
+            Media.group_id == group_id, Media.id.in_(tag_scores)
+        )
+        result = await db.execute(query)
+        media = result.scalars().all()
+        return MediaCRUD._rank_media(
+            media,
+            [tag_scores[item.id] for item in media],
+            search_term,
+            limit,
+            offset,
+        )
+
+    @staticmethod
+    async def search_media(
+        group_id: int,
+        search_term: str,
+        db: AsyncSession,
+        similarity_threshold: float | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[MediaSearchResult]:
+        """
+        Trigram search over the tags and the name of the group's media, ranked
+        like the other engines. Needs the pg_trgm extension and the
+        `media_tags_text` function created by the migrations.
+        """
+        if similarity_threshold is None:
+            similarity_threshold = settings.MEDIA_SEARCH_THRESHOLD
+        search_term = search_term.lower()
+
+        tag = func.unnest(Media.tags).column_valued("tag")
+        tag_score = func.coalesce(
+            select(func.max(func.similarity(func.lower(tag), search_term)))
+            .correlate(Media)
+            .scalar_subquery(),
+            0,
+        )
+        name_score = func.strict_word_similarity(search_term, func.lower(Media.name))
+        relevance = (tag_score + settings.MEDIA_SEARCH_NAME_WEIGHT * name_score).label(
+            "score"
+        )
+
+        query = select(Media, relevance).where(
+            Media.group_id == group_id,
+            func.greatest(tag_score, name_score) >= similarity_threshold,
+        )
+        if similarity_threshold >= settings.PG_TRGM_WORD_SIMILARITY_THRESHOLD:
+            # `<<%` is served by the GIN trigram indexes and never drops a row
+            # the exact score above would keep
+            term = literal(search_term)
+            query = query.where(
+                or_(
+                    term.op("<<%")(func.media_tags_text(Media.tags)),
+                    term.op("<<%")(func.lower(Media.name)),
                 )
-            ]
+            )
+        query = (
+            query.order_by(relevance.desc(), Media.created_at.desc(), Media.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
 
-        return [MediaGet(**media[0].to_dict()) for media in media_data]
+        result = await db.execute(query)
+        return [
+            MediaSearchResult(**media.to_dict(), score=score)
+            for media, score in result.fetchall()
+        ]
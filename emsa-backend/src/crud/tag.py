@@ -0,0 +1,182 @@
+from functools import partial
+from typing import Iterable
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.hooks import after_commit
+from src.database.models import Group, Media, Tag, media_tags
+from src.database.schemas import TagGet
+from src.services.tag_autocomplete import tag_autocomplete
+from src.services.tag_scorer import normalize_tag
+from src.services.tag_stats import GroupTagStats, tag_stats
+
+
+class TagCRUD:
+    """
+    Per-group tag dictionary. `MediaCRUD` keeps it in step with the tags
+    stored on the media rows, it is not meant to be written directly.
+    """
+
+    @staticmethod
+    def normalize_tags(tags: Iterable[str]) -> list[str]:
+        # sorted so that concurrent uploads lock the tag rows in the same order
+        return sorted({normalize_tag(tag) for tag in tags if tag.strip()})
+
+    @staticmethod
+    async def add_media_tags(
+        group_id: int, media_id: int, tags: Iterable[str], db: AsyncSession
+    ) -> None:
+        names = TagCRUD.normalize_tags(tags)
+        if not names:
+            return
+        query = (
+            pg_insert(Tag)
+            .values(
+                [
+                    {"group_id": group_id, "name": name, "usage_count": 1}
+                    for name in names
+                ]
+            )
+            .on_conflict_do_update(
+                constraint="uq_tags_group_id_name",
+                set_={"usage_count": Tag.usage_count + 1},
+            )
+            .returning(Tag.id)
+        )
+        result = await db.execute(query)
+        await db.execute(
+            insert(media_tags).values(
+                [
+                    {"media_id": media_id, "tag_id": tag_id}
+                    for tag_id in result.scalars()
+                ]
+            )
+        )
+        after_commit(db, partial(tag_autocomplete.update, group_id, names, 1))
+        after_commit(db, partial(tag_stats.add_media, group_id, names))
+
+    @staticmethod
+    async def remove_media_tags(media_id: int, db: AsyncSession) -> None:
+        result = await db.execute(
+            delete(media_tags)
+            .where(media_tags.c.media_id == media_id)
+            .returning(media_tags.c.tag_id)
+        )
+        tag_ids = result.scalars().all()
+        if not tag_ids:
+            return
+        result = await db.execute(
+            update(Tag)
+            .where(Tag.id.in_(tag_ids))
+            .values(usage_count=Tag.usage_count - 1)
+            .returning(Tag.group_id, Tag.name)
+        )
+        group_names: dict[int, list[str]] = {}
+        for group_id, name in result.all():
+            group_names.setdefault(group_id, []).append(name)
+        for group_id, names in group_names.items():
+            after_commit(db, partial(tag_autocomplete.update, group_id, names, -1))
+            after_commit(db, partial(tag_stats.remove_media, group_id, names))
+        await db.execute(delete(Tag).where(Tag.id.in_(tag_ids), Tag.usage_count <= 0))
+
+    @staticmethod
+    async def delete_group_tags(group_id: int, db: AsyncSession) -> None:
+        after_commit(db, partial(tag_autocomplete.invalidate_group, group_id))
+        after_commit(db, partial(tag_stats.invalidate_group, group_id))
+        await db.execute(
+            delete(media_tags).where(
+                media_tags.c.media_id.in_(
+                    select(Media.id).where(Media.group_id == group_id)
+                )
+            )
+        )
+        await db.execute(delete(Tag).where(Tag.group_id == group_id))
+
+    @staticmethod
+    async def get_tag(group_id: int, name: str, db: AsyncSession) -> TagGet:
+        query = select(Tag).where(
+            Tag.group_id == group_id, Tag.name == normalize_tag(name)
+        )
+        result = await db.execute(query)
+        tag = result.scalar()
+
+        if tag:
+            return TagGet(**tag.to_dict())
+        else:
+            raise ValueError(f"No tag {name} found in group with ID: {group_id}")
+
+    @staticmethod
+    async def get_group_tags(
+        group_id: int, db: AsyncSession, limit: int | None = None
+    ) -> list[TagGet]:
+        """Tags of the group, the most used first."""
+        query = (
+            select(Tag)
+            .where(Tag.group_id == group_id)
+            .order_by(Tag.usage_count.desc(), Tag.name)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return [TagGet(**tag.to_dict()) for tag in result.scalars()]
+
+    @staticmethod
+    async def autocomplete(
+        group_id: int, prefix: str, db: AsyncSession, limit: int = 10
+    ) -> list[TagGet]:
+        """
+        The most used tags of the group starting with `prefix`, served from
+        the in-memory prefix index once the group has been loaded.
+        """
+        index = tag_autocomplete.get(group_id)
+        if index is None:
+            generation = tag_autocomplete.generation
+            # the outer join tells an unknown group from a group without tags
+            query = (
+                select(Group.id, Tag.name, Tag.usage_count)
+                .outerjoin(Tag, Tag.group_id == Group.id)
+                .where(Group.id == group_id)
+            )
+            result = await db.execute(query)
+            rows = result.all()
+            if not rows:
+                raise ValueError(f"No group found with ID: {group_id}")
+            index = tag_autocomplete.build(
+                group_id,
+                [(name, count) for _, name, count in rows if name is not None],
+                generation=generation,
+            )
+
+        return [
+            TagGet(name=name, usage_count=count)
+            for name, count in index.complete(normalize_tag(prefix), limit)
+        ]
+
+    @staticmethod
+    async def get_tag_stats(group_id: int, db: AsyncSession) -> GroupTagStats:
+        """
+        Tag frequency and co-occurrence statistics of the group, read from the
+        tag dictionary on first use and kept in memory afterwards.
+        """
+        stats = tag_stats.get(group_id)
+        if stats is not None:
+            return stats
+
+        generation = tag_stats.generation
+        query = (
+            select(Group.id, media_tags.c.media_id, Tag.name)
+            .outerjoin(Tag, Tag.group_id == Group.id)
+            .outerjoin(media_tags, media_tags.c.tag_id == Tag.id)
+            .where(Group.id == group_id)
+        )
+        result = await db.execute(query)
+        rows = result.all()
+        if not rows:
+            raise ValueError(f"No group found with ID: {group_id}")
+
+        media: dict[int, list[str]] = {}
+        for _, media_id, name in rows:
+            if media_id is not None:
+                media.setdefault(media_id, []).append(name)
+        return tag_stats.build(group_id, media.values(), generation=generation)
@@ -1,9 +1,15 @@
+from datetime import datetime, timezone
+from functools import partial
+
 from jose import jwt
 from pydantic import EmailStr
-from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.models import Friendship, Token, User
+from src.database.hooks import after_commit
+from src.database.loader import BatchLoader, get_loader
+from src.database.models import Friendship, RefreshToken, RevokedToken, Token, User
 from src.database.schemas import (
     PrivateUser,
     PublicUser,
@@ -11,6 +17,8 @@ from src.database.schemas import (
     TokenGet,
     UpdateUser,
 )
+from src.services.revocation_set import revocation_set
+from src.services.token_cache import token_cache
 from src.settings import settings
 
 
@@ -28,15 +36,68 @@ class UserCRUD:
 
     @staticmethod
     async def get_user(user_mail: EmailStr, db: AsyncSession) -> PrivateUser:
-        query = select(User).where(User.mail == user_mail)
-        result = await db.execute(query)
-        user_data = result.fetchone()
+        loader = UserCRUD._user_loader(db)
+        if loader is not None:
+            user = await loader.load(user_mail)
+        else:
+            user = (await UserCRUD._get_users_by_mail([user_mail], db)).get(user_mail)
 
-        if user_data:
-            return PrivateUser(**user_data[0].to_dict())
+        if user:
+            return user
         else:
             raise ValueError(f"No user found with mail: {user_mail}")
 
+    @staticmethod
+    async def get_users_by_mail(
+        user_mails: list[EmailStr], db: AsyncSession
+    ) -> dict[str, PrivateUser]:
+        loader = UserCRUD._user_loader(db)
+        if loader is not None:
+            return await loader.load_many(user_mails)
+        return await UserCRUD._get_users_by_mail(user_mails, db)
+
+    @staticmethod
+    def prime_user(user: PrivateUser, db: AsyncSession) -> None:
+        loader = UserCRUD._user_loader(db)
+        if loader is not None:
+            loader.prime(user.mail, user)
+
+    @staticmethod
+    def _invalidate_tokens(user_mail: str, db: AsyncSession) -> None:
+        # again after commit, a request verifying the token in between still
+        # reads the old row and caches it
+        token_cache.invalidate_user(user_mail)
+        after_commit(db, partial(token_cache.invalidate_user, user_mail))
+
+    @staticmethod
+    def _user_loader(db: AsyncSession) -> BatchLoader | None:
+        return get_loader(db, "users", UserCRUD._get_users_by_mail)
+
+    @staticmethod
+    async def _get_users_by_mail(
+        user_mails: list[str], db: AsyncSession
+    ) -> dict[str, PrivateUser]:
+        query = select(User).where(User.mail.in_(user_mails))
+        result = await db.execute(query)
+        return {user.mail: PrivateUser(**user.to_dict()) for user in result.scalars()}
+
+    @staticmethod
+    async def get_user_by_token(
+        user_mail: EmailStr, access_token: str, db: AsyncSession
+    ) -> PrivateUser | None:
+        query = (
+            select(User)
+            .join(Token, Token.user_mail == User.mail)
+            .where(
+                User.mail == user_mail,
+                Token.access_token == access_token,
+                Token.is_active.is_(True),
+            )
+        )
+        result = await db.execute(query)
+        user = result.scalar()
+        return PrivateUser(**user.to_dict()) if user else None
+
     @staticmethod
     async def get_users(db: AsyncSession) -> list[PublicUser]:
         query = select(User)
@@ -48,6 +109,7 @@ class UserCRUD:
     async def update_user(
         mail: EmailStr, user: UpdateUser, db: AsyncSession
     ) -> PrivateUser:
+        UserCRUD._invalidate_tokens(mail, db)
         query = (
             update(User)
             .values(name=user.name, password_hash=user.password_hash)
@@ -58,29 +120,42 @@ class UserCRUD:
         row = result.fetchone()
 
         if row:
-            return PrivateUser(**row)
+            updated_user = PrivateUser(**row)
+            UserCRUD.prime_user(updated_user, db)
+            if user.password_hash is not None:
+                # a stolen refresh token must not outlive the old password
+                await UserCRUD.delete_refresh_tokens(mail, db)
+            return updated_user
         else:
             raise ValueError(f"No user found with mail: {mail}")
 
     @staticmethod
     async def delete_user(mail: EmailStr, db: AsyncSession) -> None:
+        UserCRUD._invalidate_tokens(mail, db)
+        loader = UserCRUD._user_loader(db)
+        if loader is not None:
+            loader.forget(mail)
         await db.execute(
             delete(Friendship).where(
                 or_(Friendship.user_mail == mail, Friendship.friend_mail == mail)
             )
         )
         await db.execute(delete(Token).where(Token.user_mail == mail))
+        await db.execute(delete(RefreshToken).where(RefreshToken.user_mail == mail))
         await db.execute(delete(User).where(User.mail == mail))
 
     @staticmethod
-    async def create_token(access_token: str, db: AsyncSession) -> TokenGet:
-        decoded_token = jwt.decode(
-            access_token, settings.AUTH_SECRET_KEY, algorithms=[settings.AUTH_ALGORITHM]
-        )
-        user_mail = decoded_token["sub"]
-
-        if await UserCRUD.get_token(user_mail, db):
-            await db.execute(delete(Token).where(Token.user_mail == user_mail))
+    async def create_token(
+        access_token: str, db: AsyncSession, user_mail: EmailStr | None = None
+    ) -> TokenGet:
+        if user_mail is None:
+            decoded_token = jwt.decode(
+                access_token,
+                settings.AUTH_SECRET_KEY,
+                algorithms=[settings.AUTH_ALGORITHM],
+            )
+            user_mail = decoded_token["sub"]
+        UserCRUD._invalidate_tokens(user_mail, db)
 
         token_data = TokenCreate(
             access_token=access_token,
@@ -88,9 +163,13 @@ class UserCRUD:
             is_active=True,
         )
         query = (
-            insert(Token)
-            .returning(Token)
+            pg_insert(Token)
             .values(token_data.model_dump(exclude={"token_type"}))
+            .on_conflict_do_update(
+                index_elements=[Token.user_mail],
+                set_={"access_token": access_token, "is_active": True},
+            )
+            .returning(Token)
         )
         result = await db.execute(query)
         row = result.fetchone()
@@ -112,7 +191,14 @@ class UserCRUD:
             return None
 
     @staticmethod
-    async def deactivate_token(current_user: PublicUser, db: AsyncSession) -> None:
+    async def deactivate_token(
+        current_user: PublicUser, db: AsyncSession, access_token: str | None = None
+    ) -> None:
+        """
+        In stateless mode `access_token` is the token to revoke, it defaults to
+        the last one issued to the user.
+        """
+        UserCRUD._invalidate_tokens(current_user.mail, db)
         result = await db.execute(
             select(Token).filter(
                 Token.user_mail == current_user.mail,
@@ -125,3 +211,86 @@ class UserCRUD:
                 .where(Token.user_mail == current_user.mail)
                 .values(is_active=False)
             )
+        if settings.AUTH_STATELESS:
+            access_token = access_token or (
+                current_token and current_token.access_token
+            )
+            if access_token:
+                claims = jwt.get_unverified_claims(access_token)
+                if "jti" in claims:
+                    await UserCRUD.revoke_token(claims["jti"], claims["exp"], db)
+
+    @staticmethod
+    async def revoke_token(jti: str, expires_at: float, db: AsyncSession) -> None:
+        # only once stored, a rolled back logout must not revoke the token
+        after_commit(db, partial(revocation_set.add, jti, expires_at))
+        await db.execute(
+            delete(RevokedToken)
+            .where(RevokedToken.expires_at <= func.now())
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            pg_insert(RevokedToken)
+            .values(
+                jti=jti,
+                expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc),
+            )
+            .on_conflict_do_nothing()
+        )
+
+    @staticmethod
+    async def get_revoked_tokens(db: AsyncSession) -> dict[str, float]:
+        query = select(RevokedToken.jti, RevokedToken.expires_at).where(
+            RevokedToken.expires_at > func.now()
+        )
+        result = await db.execute(query)
+        return {jti: expires_at.timestamp() for jti, expires_at in result.fetchall()}
+
+    @staticmethod
+    async def create_refresh_token(
+        user_mail: EmailStr, token_hash: str, expires_at: datetime, db: AsyncSession
+    ) -> None:
+        await db.execute(
+            delete(RefreshToken)
+            .where(
+                RefreshToken.user_mail == user_mail,
+                RefreshToken.expires_at <= func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            insert(RefreshToken).values(
+                token_hash=token_hash, user_mail=user_mail, expires_at=expires_at
+            )
+        )
+
+    @staticmethod
+    async def rotate_refresh_token(
+        token_hash: str, new_token_hash: str, expires_at: datetime, db: AsyncSession
+    ) -> str | None:
+        query = (
+            delete(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.expires_at > func.now(),
+            )
+            .returning(RefreshToken.user_mail)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(query)
+        user_mail = result.scalar()
+        if user_mail is None:
+            return None
+
+        await db.execute(
+            insert(RefreshToken).values(
+                token_hash=new_token_hash, user_mail=user_mail, expires_at=expires_at
+            )
+        )
+        return user_mail
+
+    @staticmethod
+    async def delete_refresh_tokens(user_mail: EmailStr, db: AsyncSession) -> None:
+        await db.execute(
+            delete(RefreshToken).where(RefreshToken.user_mail == user_mail)
+        )
@@ -11,8 +11,11 @@ def validate_not_self(
         raise ValueError("Can't send friend request to yourself")
 
 
-async def validate_user_exist(
-    mail: str,
+async def validate_users_exist(
+    mails: list[str],
     db: AsyncSession,
 ) -> None:
-    await UserCRUD.get_user(mail, db)
+    users = await UserCRUD.get_users_by_mail(mails, db)
+    for mail in mails:
+        if mail not in users:
+            raise ValueError(f"No user found with mail: {mail}")
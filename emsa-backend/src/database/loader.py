@@ -0,0 +1,88 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Hashable, Iterable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+LOADERS_KEY = "loaders"
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Request-scoped identity map with DataLoader style batching.
+
+    Loaded values are memoized by key. Keys requested concurrently (e.g. from
+    `asyncio.gather`) are fetched together with a single call to `batch_fn`.
+    """
+
+    def __init__(self, batch_fn: Callable[[list[K]], Awaitable[dict[K, V]]]) -> None:
+        self._batch_fn = batch_fn
+        self._values: dict[K, V] = {}
+        self._pending: dict[K, asyncio.Future] = {}
+        # the loop only keeps weak references to tasks
+        self._dispatch_tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V | None:
+        if key in self._values:
+            return self._values[key]
+
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                # the task first runs on the next loop iteration, after the
+                # other coroutines of a gather have queued their keys
+                task = loop.create_task(self._dispatch())
+                self._dispatch_tasks.add(task)
+                task.add_done_callback(self._dispatch_tasks.discard)
+            future = loop.create_future()
+            self._pending[key] = future
+        return await future
+
+    async def load_many(self, keys: Iterable[K]) -> dict[K, V]:
+        keys = list(dict.fromkeys(keys))
+        missing = [key for key in keys if key not in self._values]
+        if missing:
+            self._values.update(await self._batch_fn(missing))
+        return {key: self._values[key] for key in keys if key in self._values}
+
+    def prime(self, key: K, value: V) -> None:
+        self._values[key] = value
+
+    def forget(self, key: K) -> None:
+        self._values.pop(key, None)
+
+    async def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        try:
+            values = await self._batch_fn(list(pending))
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._values.update(values)
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(values.get(key))
+
+
+def attach_loaders(db: AsyncSession) -> None:
+    db.info[LOADERS_KEY] = {}
+
+
+def get_loader(
+    db: AsyncSession,
+    name: str,
+    batch_fn: Callable[[list[Any], AsyncSession], Awaitable[dict[Any, Any]]],
+) -> BatchLoader | None:
+    """Returns the session's loader called `name`, if loaders are attached to it."""
+    loaders = db.info.get(LOADERS_KEY)
+    if loaders is None:
+        return None
+    if name not in loaders:
+        loaders[name] = BatchLoader(lambda keys: batch_fn(keys, db))
+    return loaders[name]
@@ -0,0 +1,40 @@
+"""
+Helpers shared by the migration scripts.
+
+Indexes on populated tables should be built with `create_index_concurrently`
+so that the table stays writable during the build. Postgres refuses
+CONCURRENTLY inside a transaction, so the statement runs in an autocommit
+block and a revision using it should not mix it with other DDL.
+"""
+
+from alembic import op
+
+
+def create_index_concurrently(
+    name: str, table: str, columns: list[str], **kwargs
+) -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            name,
+            table,
+            columns,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kwargs,
+        )
+
+
+def drop_index_concurrently(name: str, table: str) -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            name, table_name=table, postgresql_concurrently=True, if_exists=True
+        )
+
+
+def create_unique_constraint_concurrently(
+    name: str, table: str, columns: list[str]
+) -> None:
+    # the unique index is built without blocking writes, attaching it as a
+    # constraint afterwards only takes a brief lock
+    create_index_concurrently(name, table, columns, unique=True)
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}")
@@ -0,0 +1,153 @@
+"""initial schema
+
+The tables created by `create_all` before the schema was migrated, a database
+from that time can be stamped at this revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("mail", sa.String(length=64), nullable=False),
+        sa.Column("password_hash", sa.String(length=255), nullable=False),
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.PrimaryKeyConstraint("mail"),
+    )
+    op.create_index(op.f("ix_users_mail"), "users", ["mail"], unique=False)
+    op.create_table(
+        "friend_requests",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("sender_mail", sa.String(), nullable=False),
+        sa.Column("receiver_mail", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["receiver_mail"],
+            ["users.mail"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["sender_mail"],
+            ["users.mail"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "friendships",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("friend_mail", sa.String(), nullable=True),
+        sa.Column("user_mail", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["friend_mail"],
+            ["users.mail"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_mail"],
+            ["users.mail"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "groups",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("owner_mail", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["owner_mail"],
+            ["users.mail"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "tokens",
+        sa.Column("access_token", sa.String(length=450), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("user_mail", sa.String(length=64), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_mail"],
+            ["users.mail"],
+        ),
+        sa.PrimaryKeyConstraint("access_token"),
+    )
+    op.create_table(
+        "media",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("group_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("is_image", sa.Boolean(), nullable=False),
+        sa.Column("image_path", sa.String(), nullable=True),
+        sa.Column("link", sa.String(), nullable=True),
+        sa.Column("preview_link", sa.String(), nullable=True),
+        sa.Column("uploaded_by", sa.String(length=64), nullable=True),
+        sa.Column("tags", postgresql.ARRAY(sa.Text()), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["group_id"],
+            ["groups.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "user_group_association",
+        sa.Column("user_mail", sa.String(), nullable=True),
+        sa.Column("group_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["group_id"],
+            ["groups.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_mail"],
+            ["users.mail"],
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_group_association")
+    op.drop_table("media")
+    op.drop_table("tokens")
+    op.drop_table("groups")
+    op.drop_table("friendships")
+    op.drop_table("friend_requests")
+    op.drop_index(op.f("ix_users_mail"), table_name="users")
+    op.drop_table("users")
@@ -0,0 +1,94 @@
+"""refresh tokens, revoked tokens, login attempts and one token per user
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "login_attempts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("key", sa.String(length=320), nullable=False),
+        sa.Column(
+            "attempted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_login_attempts_key_attempted_at",
+        "login_attempts",
+        ["key", "attempted_at"],
+        unique=False,
+    )
+    op.create_table(
+        "revoked_tokens",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("jti", sa.String(length=64), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("jti"),
+    )
+    op.create_index(
+        op.f("ix_revoked_tokens_expires_at"),
+        "revoked_tokens",
+        ["expires_at"],
+        unique=False,
+    )
+    op.create_table(
+        "refresh_tokens",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("token_hash", sa.String(length=64), nullable=False),
+        sa.Column("user_mail", sa.String(length=64), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_mail"],
+            ["users.mail"],
+        ),
+        sa.PrimaryKeyConstraint("token_hash"),
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_user_mail"),
+        "refresh_tokens",
+        ["user_mail"],
+        unique=False,
+    )
+    # concurrent logins could store several tokens of a user, the extra ones
+    # are dropped and their owners have to log in again
+    op.execute(
+        "DELETE FROM tokens a USING tokens b "
+        "WHERE a.user_mail = b.user_mail AND a.ctid < b.ctid"
+    )
+    op.create_unique_constraint("tokens_user_mail_key", "tokens", ["user_mail"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("tokens_user_mail_key", "tokens", type_="unique")
+    op.drop_index(op.f("ix_refresh_tokens_user_mail"), table_name="refresh_tokens")
+    op.drop_table("refresh_tokens")
+    op.drop_index(op.f("ix_revoked_tokens_expires_at"), table_name="revoked_tokens")
+    op.drop_table("revoked_tokens")
+    op.drop_index("ix_login_attempts_key_attempted_at", table_name="login_attempts")
+    op.drop_table("login_attempts")
@@ -0,0 +1,77 @@
+"""indexes and unique constraints for hot queries
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+
+from src.database.migrations.helpers import (
+    create_index_concurrently,
+    create_unique_constraint_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+UNIQUE_CONSTRAINTS = [
+    (
+        "uq_friendships_user_mail_friend_mail",
+        "friendships",
+        ["user_mail", "friend_mail"],
+    ),
+    (
+        "uq_friend_requests_sender_mail_receiver_mail",
+        "friend_requests",
+        ["sender_mail", "receiver_mail"],
+    ),
+    (
+        "uq_user_group_association_group_id_user_mail",
+        "user_group_association",
+        ["group_id", "user_mail"],
+    ),
+]
+
+INDEXES = [
+    ("ix_friendships_friend_mail", "friendships", ["friend_mail"]),
+    ("ix_friend_requests_receiver_mail", "friend_requests", ["receiver_mail"]),
+    ("ix_user_group_association_user_mail", "user_group_association", ["user_mail"]),
+    ("ix_groups_owner_mail", "groups", ["owner_mail"]),
+    ("ix_media_group_id_created_at", "media", ["group_id", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    # keep the oldest row of every duplicate so the unique constraints apply
+    op.execute(
+        "DELETE FROM friendships a USING friendships b "
+        "WHERE a.user_mail = b.user_mail AND a.friend_mail = b.friend_mail "
+        "AND a.id > b.id"
+    )
+    op.execute(
+        "DELETE FROM friend_requests a USING friend_requests b "
+        "WHERE a.sender_mail = b.sender_mail AND a.receiver_mail = b.receiver_mail "
+        "AND a.id > b.id"
+    )
+    op.execute(
+        "DELETE FROM user_group_association a USING user_group_association b "
+        "WHERE a.group_id = b.group_id AND a.user_mail = b.user_mail "
+        "AND a.ctid > b.ctid"
+    )
+
+    for name, table, columns in UNIQUE_CONSTRAINTS:
+        create_unique_constraint_concurrently(name, table, columns)
+    for name, table, columns in INDEXES:
+        create_index_concurrently(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        drop_index_concurrently(name, table)
+    for name, table, _ in reversed(UNIQUE_CONSTRAINTS):
+        op.drop_constraint(name, table, type_="unique")
@@ -0,0 +1,49 @@
+"""trigram indexes for the postgres media search engine
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+import logging
+
+import sqlalchemy as sa
+from alembic import op
+
+from src.database.migrations.helpers import drop_index_concurrently
+from src.database.trigram import (
+    CREATE_EXTENSION,
+    CREATE_INDEXES,
+    CREATE_MEDIA_TAGS_TEXT,
+)
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic")
+
+
+def upgrade() -> None:
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    )
+    if available.scalar() is None:
+        # only MEDIA_SEARCH_ENGINE=postgres needs it, once the extension is
+        # installed run `python -m src.database.trigram` to create the rest
+        logger.warning("pg_trgm is not available, skipping the trigram indexes")
+        return
+
+    op.execute(CREATE_EXTENSION)
+    op.execute(CREATE_MEDIA_TAGS_TEXT)
+    with op.get_context().autocommit_block():
+        for statement in CREATE_INDEXES:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    drop_index_concurrently("ix_media_name_trgm", "media")
+    drop_index_concurrently("ix_media_tags_trgm", "media")
+    op.execute("DROP FUNCTION IF EXISTS media_tags_text(text[])")
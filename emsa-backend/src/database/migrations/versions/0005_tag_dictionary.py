@@ -0,0 +1,70 @@
+"""normalized per-group tag dictionary
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tags",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("group_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.Text(), nullable=False),
+        sa.Column("usage_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["group_id"],
+            ["groups.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("group_id", "name", name="uq_tags_group_id_name"),
+    )
+    op.create_index("ix_tags_group_id_usage_count", "tags", ["group_id", "usage_count"])
+    op.create_table(
+        "media_tags",
+        sa.Column("media_id", sa.Integer(), nullable=False),
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["media_id"],
+            ["media.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["tag_id"],
+            ["tags.id"],
+        ),
+        sa.PrimaryKeyConstraint("media_id", "tag_id"),
+    )
+    op.create_index(op.f("ix_media_tags_tag_id"), "media_tags", ["tag_id"])
+
+    # backfill from the tag arrays, normalized like TagCRUD.normalize_tags
+    op.execute(
+        "INSERT INTO tags (group_id, name, usage_count) "
+        "SELECT group_id, name, count(*) FROM ("
+        "  SELECT DISTINCT media.id, media.group_id, lower(tag) AS name"
+        "  FROM media, unnest(media.tags) AS tag WHERE btrim(tag) <> ''"
+        ") AS media_tag GROUP BY group_id, name"
+    )
+    op.execute(
+        "INSERT INTO media_tags (media_id, tag_id) "
+        "SELECT DISTINCT media.id, tags.id "
+        "FROM media, unnest(media.tags) AS tag "
+        "JOIN tags ON tags.name = lower(tag) "
+        "WHERE tags.group_id = media.group_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_media_tags_tag_id"), table_name="media_tags")
+    op.drop_table("media_tags")
+    op.drop_index("ix_tags_group_id_usage_count", table_name="tags")
+    op.drop_table("tags")
@@ -0,0 +1,37 @@
+"""media.created_at is required
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # rows inserted with an explicit NULL sort as the oldest ones
+    op.execute("UPDATE media SET created_at = 'epoch' WHERE created_at IS NULL")
+    op.alter_column(
+        "media",
+        "created_at",
+        existing_type=sa.DateTime(timezone=True),
+        existing_server_default=sa.text("now()"),
+        nullable=False,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "media",
+        "created_at",
+        existing_type=sa.DateTime(timezone=True),
+        existing_server_default=sa.text("now()"),
+        nullable=True,
+    )
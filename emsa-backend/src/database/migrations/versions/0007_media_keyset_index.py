@@ -0,0 +1,32 @@
+"""index backing the keyset pagination of group content
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 20:10:00.000000
+
+"""
+from src.database.migrations.helpers import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # the id column breaks created_at ties, the old index is a prefix of it
+    create_index_concurrently(
+        "ix_media_group_id_created_at_id", "media", ["group_id", "created_at", "id"]
+    )
+    drop_index_concurrently("ix_media_group_id_created_at", "media")
+
+
+def downgrade() -> None:
+    create_index_concurrently(
+        "ix_media_group_id_created_at", "media", ["group_id", "created_at"]
+    )
+    drop_index_concurrently("ix_media_group_id_created_at_id", "media")
@@ -5,10 +5,12 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Text,
+    UniqueConstraint,
     cast,
     func,
 )
@@ -25,8 +27,18 @@ class TimestampMixin:
 user_group_association = Table(
     "user_group_association",
     Base.metadata,
-    Column("user_mail", String, ForeignKey("users.mail")),
+    Column("user_mail", String, ForeignKey("users.mail"), index=True),
     Column("group_id", Integer, ForeignKey("groups.id")),
+    UniqueConstraint(
+        "group_id", "user_mail", name="uq_user_group_association_group_id_user_mail"
+    ),
+)
+
+media_tags = Table(
+    "media_tags",
+    Base.metadata,
+    Column("media_id", Integer, ForeignKey("media.id"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True, index=True),
 )
 
 
@@ -79,7 +91,7 @@ class Token(Base):
 
     access_token = Column(String(450), primary_key=True)
     is_active = Column(Boolean, nullable=False, default=False)
-    user_mail = Column(String(64), ForeignKey("users.mail"))
+    user_mail = Column(String(64), ForeignKey("users.mail"), unique=True)
     user: "User" = relationship("User", back_populates="token")
 
     def __repr__(self) -> str:
@@ -98,12 +110,64 @@ class Token(Base):
         }
 
 
+class RefreshToken(Base, TimestampMixin):
+    __tablename__ = "refresh_tokens"
+
+    token_hash: str = Column(String(64), primary_key=True)
+    user_mail: str = Column(
+        String(64), ForeignKey("users.mail"), nullable=False, index=True
+    )
+    expires_at: datetime = Column(DateTime(timezone=True), nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "token_hash": self.token_hash,
+            "user_mail": self.user_mail,
+            "expires_at": self.expires_at,
+        }
+
+
+class RevokedToken(Base, TimestampMixin):
+    __tablename__ = "revoked_tokens"
+
+    jti: str = Column(String(64), primary_key=True)
+    expires_at: datetime = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "jti": self.jti,
+            "expires_at": self.expires_at,
+        }
+
+
+class LoginAttempt(Base):
+    __tablename__ = "login_attempts"
+    __table_args__ = (
+        Index("ix_login_attempts_key_attempted_at", "key", "attempted_at"),
+    )
+
+    id: int = Column(Integer, primary_key=True)
+    key: str = Column(String(320), nullable=False)
+    attempted_at: datetime = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
 class FriendRequest(Base, TimestampMixin):
     __tablename__ = "friend_requests"
+    __table_args__ = (
+        UniqueConstraint(
+            "sender_mail",
+            "receiver_mail",
+            name="uq_friend_requests_sender_mail_receiver_mail",
+        ),
+    )
 
     id: int = Column(Integer, primary_key=True)
     sender_mail: str = Column(String, ForeignKey("users.mail"), nullable=False)
-    receiver_mail: str = Column(String, ForeignKey("users.mail"), nullable=False)
+    receiver_mail: str = Column(
+        String, ForeignKey("users.mail"), nullable=False, index=True
+    )
 
     sender: User = relationship("User", foreign_keys=[sender_mail])
     receiver: User = relationship("User", foreign_keys=[receiver_mail])
@@ -118,9 +182,14 @@ class FriendRequest(Base, TimestampMixin):
 
 class Friendship(Base, TimestampMixin):
     __tablename__ = "friendships"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_mail", "friend_mail", name="uq_friendships_user_mail_friend_mail"
+        ),
+    )
 
     id: int = Column(Integer, primary_key=True)
-    friend_mail: str = Column(String, ForeignKey("users.mail"))
+    friend_mail: str = Column(String, ForeignKey("users.mail"), index=True)
     user_mail: str = Column(String, ForeignKey("users.mail"))
 
     # many-to-one relationship with the User
@@ -137,7 +206,9 @@ class Group(Base, TimestampMixin):
 
     id: int = Column(Integer, primary_key=True)
     name: str = Column(String(64), nullable=False)
-    owner_mail: str = Column(String, ForeignKey("users.mail"), nullable=False)
+    owner_mail: str = Column(
+        String, ForeignKey("users.mail"), nullable=False, index=True
+    )
     owner: User = relationship("User", back_populates="owned_groups")
 
     # many-to-many relationship with the User
@@ -157,7 +228,14 @@ class Group(Base, TimestampMixin):
 
 class Media(Base, TimestampMixin):
     __tablename__ = "media"
+    __table_args__ = (
+        Index("ix_media_group_id_created_at_id", "group_id", "created_at", "id"),
+    )
 
+    # keyset pagination needs a sort key on every row
+    created_at: datetime = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
     id: int = Column(Integer, primary_key=True)
     group_id: int = Column(Integer, ForeignKey("groups.id"), nullable=False)
     name: str = Column(String, nullable=False, default="")
@@ -199,3 +277,26 @@ class Media(Base, TimestampMixin):
             "preview_link": self.preview_link,
             "tags": self.tags,
         }
+
+
+class Tag(Base):
+    __tablename__ = "tags"
+    __table_args__ = (
+        UniqueConstraint("group_id", "name", name="uq_tags_group_id_name"),
+        Index("ix_tags_group_id_usage_count", "group_id", "usage_count"),
+    )
+
+    id: int = Column(Integer, primary_key=True)
+    group_id: int = Column(Integer, ForeignKey("groups.id"), nullable=False)
+    # normalized tag, the media keep the tags as typed
+    name: str = Column(Text, nullable=False)
+    # number of media of the group carrying the tag
+    usage_count: int = Column(Integer, nullable=False, default=0)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "group_id": self.group_id,
+            "name": self.name,
+            "usage_count": self.usage_count,
+        }
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from typing import Literal
+
+from pydantic import BaseModel, EmailStr, Field
 
 
 class PublicUser(BaseModel):
@@ -85,5 +87,40 @@ class MediaUpdate(BaseModel):
     preview_link: str | None = None
 
 
+class MediaSearchResult(MediaGet):
+    score: float | None = None
+
+
+class TagGet(BaseModel):
+    name: str
+    usage_count: int
+
+
+MediaField = Literal[
+    "id",
+    "group_id",
+    "name",
+    "is_image",
+    "image_path",
+    "link",
+    "preview_link",
+    "uploaded_by",
+    "tags",
+]
+
+
+class MediaPage(BaseModel):
+    items: list[MediaGet]
+    # None on the last page
+    next_cursor: str | None = None
+
+
 class MediaQuery(BaseModel):
     search_term: str | None = None
+    limit: int | None = Field(None, ge=1)
+    # offset and with_score only apply to searches, cursor only to listings
+    offset: int = Field(0, ge=0)
+    with_score: bool = False
+    cursor: str | None = None
+    # columns to return, all of them when None
+    fields: list[MediaField] | None = None
@@ -1,13 +1,43 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from src.database.loader import attach_loaders
+from src.database.pool import InstrumentedQueuePool
 from src.settings import settings
 
-engine = create_async_engine(
-    url=settings.DATABASE_URL,
-    echo=True,
+
+def build_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url=url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+engine = build_engine(settings.DATABASE_URL)
+# read-only endpoints use the replica when one is configured
+read_engine = (
+    build_engine(settings.READ_DATABASE_URL) if settings.READ_DATABASE_URL else engine
+)
+
+# reads either skip BEGIN/COMMIT entirely or run in READ ONLY transactions
+read_only_engine = read_engine.execution_options(
+    **(
+        {"isolation_level": "AUTOCOMMIT"}
+        if settings.DB_READ_AUTOCOMMIT
+        else {"postgresql_readonly": True}
+    )
 )
+
 async_session_global = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -15,17 +45,39 @@ async_session_global = sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False,
 )
+async_read_session = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_only_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
 
 Base = declarative_base()
 
 
 async def get_db():
+    # the session checks out a connection on its first statement only, so
+    # requests that never query skip the pool as well as commit and rollback
     db = async_session_global()
+    attach_loaders(db)
     try:
         yield db
-        await db.commit()
+        if db.in_transaction():
+            await db.commit()
     except Exception:
-        await db.rollback()
+        if db.in_transaction():
+            await db.rollback()
         raise
     finally:
         await db.close()
+
+
+async def get_read_db():
+    # nothing to commit, closing the session releases the connection
+    db = async_read_session()
+    attach_loaders(db)
+    try:
+        yield db
+    finally:
+        await db.close()
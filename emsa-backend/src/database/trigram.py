@@ -0,0 +1,71 @@
+"""
+Objects used by the postgres media search engine.
+
+They are created by the 0004 migration when pg_trgm is available. Every
+statement is idempotent, so after installing the extension later the step can
+be run on its own with:
+`python -m src.database.trigram`
+"""
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from src.settings import settings
+
+CREATE_EXTENSION = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+
+# array_to_string is only stable, an immutable wrapper can be indexed
+CREATE_MEDIA_TAGS_TEXT = (
+    "CREATE OR REPLACE FUNCTION media_tags_text(tags text[]) RETURNS text "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE "
+    "AS $$ SELECT lower(array_to_string(tags, ' ')) $$"
+)
+
+# built concurrently, so they have to run outside of a transaction
+CREATE_INDEXES = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_media_tags_trgm "
+    "ON media USING gin (media_tags_text(tags) gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_media_name_trgm "
+    "ON media USING gin (lower(name) gin_trgm_ops)",
+]
+
+
+async def is_trigram_search_installed(conn: AsyncConnection) -> bool:
+    result = await conn.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') "
+            "AND to_regprocedure('media_tags_text(text[])') IS NOT NULL"
+        )
+    )
+    return bool(result.scalar())
+
+
+async def check_trigram_search(engine: AsyncEngine) -> None:
+    """Fails unless the objects the postgres search engine queries exist."""
+    async with engine.connect() as conn:
+        if not await is_trigram_search_installed(conn):
+            raise RuntimeError(
+                "MEDIA_SEARCH_ENGINE=postgres needs the pg_trgm extension and the "
+                "media_tags_text function, create them with "
+                "`python -m src.database.trigram`"
+            )
+
+
+async def create_trigram_search(url: str = settings.DATABASE_URL) -> None:
+    engine = create_async_engine(url, isolation_level="AUTOCOMMIT")
+    try:
+        async with engine.connect() as conn:
+            for statement in [
+                CREATE_EXTENSION,
+                CREATE_MEDIA_TAGS_TEXT,
+                *CREATE_INDEXES,
+            ]:
+                await conn.execute(text(statement))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(create_trigram_search())
@@ -4,3 +4,19 @@ class TagAlreadyExist(ValueError):
 
 class IncorrectUsernameOrPassword(Exception):
     detail = "Incorrect username or password"
+
+
+class InvalidRefreshToken(Exception):
+    detail = "Invalid or expired refresh token"
+
+
+class PasswordHasherBusy(Exception):
+    detail = "Too many concurrent authentication requests, try again later"
+
+
+class TooManyLoginAttempts(Exception):
+    detail = "Too many login attempts, try again later"
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(self.detail)
+        self.retry_after = retry_after
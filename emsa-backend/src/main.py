@@ -5,8 +5,11 @@ from fastapi import FastAPI
 from fastapi.logger import logger as fastapi_logger
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.database.session import Base, engine
+from src.database.session import read_engine
+from src.database.trigram import check_trigram_search
 from src.routes import group, health_check, media, user
+from src.services.password_hasher import password_hasher
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -14,13 +17,12 @@ logger.setLevel(logging.INFO)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
+    # the schema is owned by the migrations, see `make migrate`
+    if settings.MEDIA_SEARCH_ENGINE == "postgres":
+        await check_trigram_search(read_engine)
     yield
 
-    async with engine.connect() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+    password_hasher.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -36,6 +38,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 fastapi_logger.setLevel(logging.WARNING)
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+
+from src.settings import settings
 
 
 class LoginRequest(BaseModel):
@@ -13,6 +15,11 @@ class RegisterRequest(LoginRequest):
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: str | None = None
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
 
 class GetPendingRequests(BaseModel):
@@ -37,12 +44,25 @@ class ProposeTagsRequest(BaseModel):
     is_image: bool
     image_path: str = ""
     link: str = ""
+    # adds tags the group already uses together with the proposed ones
+    group_id: int | None = None
 
 
 class ProposeTagsResponse(BaseModel):
     proposed_tags: list[str]
 
 
+class ProposeTagsBatchRequest(BaseModel):
+    items: list[ProposeTagsRequest] = Field(
+        max_length=settings.TAG_PROPOSER_MAX_BATCH_SIZE
+    )
+
+
+class ProposeTagsBatchResponse(BaseModel):
+    # in the order of the request items
+    proposals: list[ProposeTagsResponse]
+
+
 class AddLinkRequest(BaseModel):
     group_id: int
     link: str
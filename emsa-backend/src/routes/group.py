@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse
 from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -6,9 +7,21 @@ from src.authorization import get_current_active_user
 from src.crud.friend import FriendCRUD
 from src.crud.group import GroupCRUD
 from src.crud.media import MediaCRUD
-from src.database.schemas import GroupCreate, GroupGet, MediaGet, MediaQuery, PublicUser
-from src.database.session import get_db
+from src.crud.tag import TagCRUD
+from src.database.pagination import InvalidCursorError
+from src.database.schemas import (
+    GroupCreate,
+    GroupGet,
+    MediaField,
+    MediaGet,
+    MediaQuery,
+    MediaSearchResult,
+    PublicUser,
+    TagGet,
+)
+from src.database.session import get_db, get_read_db
 from src.routes.contracts import AddGroupMembersRequest
+from src.settings import settings
 
 router = APIRouter()
 
@@ -116,7 +129,7 @@ async def remove_member(
     },
 )
 async def user_groups(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: PublicUser = Depends(get_current_active_user),
 ) -> list[GroupGet]:
     try:
@@ -177,7 +190,7 @@ async def mutual_groups(
 )
 async def group_members(
     group_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: PublicUser = Depends(get_current_active_user),
 ) -> list[PublicUser]:
     try:
@@ -189,13 +202,23 @@ async def group_members(
 @router.get(
     "/group_content/{group_id}",
     summary="Get group content",
-    description="Retrieve a list of media related to group by group_id.",
-    response_model=list[MediaGet],
+    description="Retrieve a list of media related to group by group_id."
+    " With a search_term the results are ranked by relevance and can be paged"
+    " with limit and offset, with_score adds the relevance score to every item."
+    " Without one the media are listed newest first, passing limit or cursor"
+    " returns one page of them and the X-Next-Cursor header holds the cursor"
+    " of the next page. fields restricts every item to the listed columns.",
+    response_model=list[MediaSearchResult],
+    response_model_exclude_none=True,
     responses={
         status.HTTP_200_OK: {
             "description": "Group media retrieved successfully",
             "content": {"application/json": {}},
         },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Invalid cursor",
+            "content": {"application/json": {}},
+        },
         status.HTTP_404_NOT_FOUND: {
             "description": "Group not found",
             "content": {"application/json": {}},
@@ -204,16 +227,126 @@ async def group_members(
 )
 async def group_content(
     group_id: int,
-    search_query: MediaQuery = Depends(),
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    search_term: str | None = None,
+    limit: int | None = Query(None, ge=1, le=settings.MEDIA_PAGE_MAX_SIZE),
+    offset: int = Query(0, ge=0),
+    with_score: bool = False,
+    cursor: str | None = None,
+    fields: list[MediaField] | None = Query(None),
+    db: AsyncSession = Depends(get_read_db),
     _: PublicUser = Depends(get_current_active_user),
 ) -> list[MediaGet]:
+    search_query = MediaQuery(
+        search_term=search_term,
+        limit=limit,
+        offset=offset,
+        with_score=with_score,
+        cursor=cursor,
+        fields=fields,
+    )
+    paged = not search_query.search_term and (
+        search_query.limit is not None or search_query.cursor is not None
+    )
     try:
-        return await MediaCRUD.get_media_by_group(
-            group_id=group_id,
-            query_params=search_query,
-            db=db,
+        if paged:
+            page = await MediaCRUD.get_media_page(
+                group_id,
+                db,
+                limit=search_query.limit,
+                cursor=search_query.cursor,
+                fields=search_query.fields,
+            )
+            if page.next_cursor is not None:
+                response.headers["X-Next-Cursor"] = page.next_cursor
+            media = page.items
+        else:
+            media = await MediaCRUD.get_media_by_group(
+                group_id=group_id,
+                query_params=search_query,
+                db=db,
+            )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    if not search_query.with_score:
+        for item in media:
+            if isinstance(item, MediaSearchResult):
+                item.score = None
+    if search_query.fields is not None:
+        # a projection does not fit the response model, serialize it as is
+        include = set(search_query.fields)
+        if search_query.with_score:
+            include.add("score")
+        return JSONResponse(
+            [
+                item.model_dump(mode="json", include=include, exclude_none=True)
+                for item in media
+            ],
+            headers=response.headers,
         )
+    return media
+
+
+@router.get(
+    "/group_tags/{group_id}",
+    summary="Get group tags",
+    description="Retrieve the tags used in a group by group_id together with the"
+    " number of media carrying them, the most used first.",
+    response_model=list[TagGet],
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Group tags retrieved successfully",
+            "content": {"application/json": {}},
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Group not found",
+            "content": {"application/json": {}},
+        },
+    },
+)
+async def group_tags(
+    group_id: int,
+    limit: int | None = Query(None, ge=1),
+    db: AsyncSession = Depends(get_read_db),
+    _: PublicUser = Depends(get_current_active_user),
+) -> list[TagGet]:
+    try:
+        await GroupCRUD.get_group(group_id, db)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return await TagCRUD.get_group_tags(group_id, db, limit=limit)
+
+
+@router.get(
+    "/group_tags/{group_id}/autocomplete",
+    summary="Autocomplete group tags",
+    description="Retrieve the most used tags of a group starting with the given"
+    " prefix, meant to be called on every keystroke of the tag input.",
+    response_model=list[TagGet],
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Matching tags retrieved successfully",
+            "content": {"application/json": {}},
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Group not found",
+            "content": {"application/json": {}},
+        },
+    },
+)
+async def group_tags_autocomplete(
+    group_id: int,
+    prefix: str = "",
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    _: PublicUser = Depends(get_current_active_user),
+) -> list[TagGet]:
+    try:
+        return await TagCRUD.autocomplete(group_id, prefix, db, limit=limit)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
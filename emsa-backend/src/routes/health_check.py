@@ -2,7 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.session import get_db
+from src.database.pool import pool_status
+from src.database.session import engine, get_db, read_engine
+from src.services.search_cache import search_cache
+from src.services.search_index import search_index
+from src.settings import settings
 
 router = APIRouter()
 
@@ -35,3 +39,38 @@ async def health(db: AsyncSession = Depends(get_db)):
         return {"status": "healthy"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/health/pool",
+    summary="Connection Pool Endpoint",
+    description="Report the database connection pool usage: checked out and idle"
+    " connections, overflow and time spent waiting for a connection.",
+    response_model=dict,
+    responses={
+        200: {"description": "Pool status", "content": {"application/json": {}}}
+    },
+)
+async def pool_health():
+    status = {"primary": pool_status(engine)}
+    if read_engine is not engine:
+        status["replica"] = pool_status(read_engine)
+    return status
+
+
+@router.get(
+    "/health/search",
+    summary="Media Search Endpoint",
+    description="Report the media search engine together with the hit ratio of"
+    " the search result cache and the size of the in-memory tag index.",
+    response_model=dict,
+    responses={
+        200: {"description": "Search status", "content": {"application/json": {}}}
+    },
+)
+async def search_health():
+    return {
+        "engine": settings.MEDIA_SEARCH_ENGINE,
+        "cache": search_cache.stats(),
+        "index": {"groups": len(search_index), "size": search_index.size},
+    }
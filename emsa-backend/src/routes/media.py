@@ -6,16 +6,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.authorization import get_current_active_user
 from src.crud.group import GroupCRUD
 from src.crud.media import MediaCRUD
+from src.crud.tag import TagCRUD
 from src.database.schemas import MediaCreate, MediaGet, MediaUpdate, PublicUser
-from src.database.session import get_db
-from src.routes.contracts import AddLinkRequest, ProposeTagsRequest, ProposeTagsResponse
+from src.database.session import get_db, get_read_db
+from src.routes.contracts import (
+    AddLinkRequest,
+    ProposeTagsBatchRequest,
+    ProposeTagsBatchResponse,
+    ProposeTagsRequest,
+    ProposeTagsResponse,
+)
 from src.services.cloud_storage import (
     CloudStorage,
     FailedToDeleteImageException,
     FailedToUploadImageException,
 )
 from src.services.preview_generator import link_preview_generator, preview_link_upload
-from src.services.tag_proposer import propose_tag_from_link, propose_tags_from_name
+from src.services.tag_proposer import propose_tags
 
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
@@ -27,7 +34,8 @@ router = APIRouter()
     "/propose_tags",
     summary="Propose tags for media",
     description="Retrieve a list of proposed tags for a given media link or image."
-    " Tags are created by media name and possibly by link domain",
+    " Tags are created by media name and possibly by link domain. With a"
+    " group_id, tags the group uses together with those are proposed as well.",
     response_model=ProposeTagsResponse,
     responses={
         status.HTTP_200_OK: {
@@ -35,22 +43,67 @@ router = APIRouter()
             "content": {"application/json": {}},
         },
         status.HTTP_404_NOT_FOUND: {
-            "description": "Media not found",
+            "description": "Group not found",
             "content": {"application/json": {}},
         },
     },
 )
 async def proposed_tags(
     request: ProposeTagsRequest,
+    db: AsyncSession = Depends(get_read_db),
     _: PublicUser = Depends(get_current_active_user),
 ) -> ProposeTagsResponse:
-    tags = propose_tags_from_name(request.name)
-    if not request.is_image:
-        tag = propose_tag_from_link(request.link)
-        tags.append(tag) if tag else None
+    stats = None
+    if request.group_id is not None:
+        try:
+            stats = await TagCRUD.get_tag_stats(request.group_id, db)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    tags = propose_tags(request.name, request.is_image, request.link, stats)
     return ProposeTagsResponse(proposed_tags=tags)
 
 
+@router.post(
+    "/propose_tags/batch",
+    summary="Propose tags for many media",
+    description="Retrieve proposed tags for a list of media in one call, the"
+    " proposals are returned in the order of the items. Meant for bulk imports.",
+    response_model=ProposeTagsBatchResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Proposed tags retrieved successfully",
+            "content": {"application/json": {}},
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Group not found",
+            "content": {"application/json": {}},
+        },
+    },
+)
+async def proposed_tags_batch(
+    request: ProposeTagsBatchRequest,
+    db: AsyncSession = Depends(get_read_db),
+    _: PublicUser = Depends(get_current_active_user),
+) -> ProposeTagsBatchResponse:
+    group_stats = {}
+    for group_id in {item.group_id for item in request.items} - {None}:
+        try:
+            group_stats[group_id] = await TagCRUD.get_tag_stats(group_id, db)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return ProposeTagsBatchResponse(
+        proposals=[
+            ProposeTagsResponse(
+                proposed_tags=propose_tags(
+                    item.name, item.is_image, item.link, group_stats.get(item.group_id)
+                )
+            )
+            for item in request.items
+        ]
+    )
+
+
 @router.post(
     "/add_link",
     status_code=status.HTTP_201_CREATED,
@@ -1,29 +1,39 @@
 from datetime import timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.authorization import (
     authenticate_user,
     create_access_token,
+    create_refresh_token,
     get_current_active_user,
-    get_password_hash,
+    oauth2_scheme,
+    rotate_refresh_token,
 )
 from src.crud.friend import FriendCRUD
 from src.crud.group import GroupCRUD
 from src.crud.user import UserCRUD
 from src.database.schemas import FriendRequestGet, PrivateUser, PublicUser, UpdateUser
-from src.database.session import get_db
-from src.exceptions import IncorrectUsernameOrPassword
+from src.database.session import get_db, get_read_db
+from src.exceptions import (
+    IncorrectUsernameOrPassword,
+    InvalidRefreshToken,
+    PasswordHasherBusy,
+    TooManyLoginAttempts,
+)
 from src.routes.contracts import (
     AddFriendRequest,
     GetPendingRequests,
     GetSentRequests,
     LoginRequest,
+    RefreshTokenRequest,
     RegisterRequest,
     TokenResponse,
 )
+from src.services.password_hasher import password_hasher
+from src.services.rate_limiter import login_rate_limiter
 from src.settings import settings
 
 router = APIRouter()
@@ -63,7 +73,12 @@ async def register(
             status_code=status.HTTP_409_CONFLICT, detail="Email already registered"
         )
 
-    password_hash = get_password_hash(user_data.password)
+    try:
+        password_hash = await password_hasher.hash(user_data.password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=e.detail
+        )
     user_db_data = PrivateUser(
         **user_data.model_dump(exclude={"password"}), password_hash=password_hash
     )
@@ -91,16 +106,26 @@ async def register(
             "description": "Incorrect username or password or user does not exist",
             "content": {"application/json": {}},
         },
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "description": "Too many login attempts",
+            "content": {"application/json": {}},
+        },
     },
 )
 async def login(
     request: LoginRequest,
+    http_request: Request,
     db: AsyncSession = Depends(get_db),
 ) -> TokenResponse:
+    source = http_request.client.host if http_request.client else "unknown"
     try:
-        await UserCRUD.get_user(request.mail, db)
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        await login_rate_limiter.check(source, request.mail)
+    except TooManyLoginAttempts as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)},
+        )
     try:
         user = await authenticate_user(request.mail, request.password, db)
     except IncorrectUsernameOrPassword as e:
@@ -108,6 +133,10 @@ async def login(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=e.detail,
         )
+    except PasswordHasherBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=e.detail
+        )
 
     access_token_expires = timedelta(minutes=settings.AUTH_TOKEN_EXPIRE_MIN)
     access_token = await create_access_token(
@@ -115,7 +144,48 @@ async def login(
         db=db,
         expires_delta=access_token_expires,
     )
-    return TokenResponse(**{"access_token": access_token})
+    refresh_token = await create_refresh_token(user.mail, db)
+    return TokenResponse(
+        **{"access_token": access_token, "refresh_token": refresh_token}
+    )
+
+
+@router.post(
+    "/token/refresh",
+    status_code=status.HTTP_201_CREATED,
+    summary="Refresh access token",
+    description="Exchange a refresh token for a new access token and refresh token."
+    " The passed refresh token can't be used again.",
+    response_model=TokenResponse,
+    responses={
+        status.HTTP_201_CREATED: {
+            "description": "Access token refreshed successfully",
+            "content": {"application/json": {}},
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Invalid or expired refresh token",
+            "content": {"application/json": {}},
+        },
+    },
+)
+async def refresh_access_token(
+    request: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_db),
+) -> TokenResponse:
+    try:
+        user_mail, refresh_token = await rotate_refresh_token(request.refresh_token, db)
+    except InvalidRefreshToken as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=e.detail)
+
+    access_token_expires = timedelta(minutes=settings.AUTH_TOKEN_EXPIRE_MIN)
+    access_token = await create_access_token(
+        data={"sub": user_mail},
+        db=db,
+        expires_delta=access_token_expires,
+    )
+    return TokenResponse(
+        **{"access_token": access_token, "refresh_token": refresh_token}
+    )
 
 
 @router.post(
@@ -137,8 +207,10 @@ async def login(
 async def logout(
     db: AsyncSession = Depends(get_db),
     current_user: PublicUser = Depends(get_current_active_user),
+    token: str = Depends(oauth2_scheme),
 ) -> None:
-    await UserCRUD.deactivate_token(current_user, db)
+    await UserCRUD.deactivate_token(current_user, db, token)
+    await UserCRUD.delete_refresh_tokens(current_user.mail, db)
 
 
 @router.get(
@@ -285,7 +357,7 @@ async def create_friend_request(
     },
 )
 async def get_pending_requests(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: PublicUser = Depends(get_current_active_user),
 ) -> list[GetPendingRequests]:
     try:
@@ -312,7 +384,7 @@ async def get_pending_requests(
     },
 )
 async def get_sent_requests(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: PublicUser = Depends(get_current_active_user),
 ) -> list[GetSentRequests]:
     try:
@@ -437,8 +509,7 @@ async def remove_friend(
     },
 )
 async def get_user_friends(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: PublicUser = Depends(get_current_active_user),
 ) -> list[PublicUser]:
-    user = await UserCRUD.get_user(current_user.mail, db)
-    return await FriendCRUD.get_user_friends(user.mail, db)
+    return await FriendCRUD.get_user_friends(current_user.mail, db)
@@ -0,0 +1,90 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from src.exceptions import PasswordHasherBusy
+from src.settings import settings
+
+
+def hash_password(password: str, method: str) -> str:
+    return generate_password_hash(password, method=method)
+
+
+def check_password(hashed_password: str, password: str) -> bool:
+    return check_password_hash(pwhash=hashed_password, password=password)
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification in a process pool, so scrypt
+    never blocks the event loop.
+
+    At most `workers + queue_size` jobs are accepted at once, any further
+    job is rejected with PasswordHasherBusy. With `workers=0` jobs run inline.
+    """
+
+    def __init__(self, workers: int, queue_size: int, method: str) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.method = method
+        self._executor: ProcessPoolExecutor | None = None
+        self._in_flight = 0
+        # released from the pool's done-callbacks, which may run on its thread
+        self._in_flight_lock = threading.Lock()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.method)
+
+    async def verify(self, hashed_password: str, password: str) -> bool:
+        return await self._run(check_password, hashed_password, password)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.workers <= 0:
+            return func(*args)
+        with self._in_flight_lock:
+            if self._in_flight >= self.workers + self.queue_size:
+                raise PasswordHasherBusy
+            self._in_flight += 1
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # a cancelled request does not stop a running job, its slot is only
+        # released once the pool is done with it
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+
+    def _release(self, future: Future | None = None) -> None:
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    method=settings.PASSWORD_HASH_METHOD,
+)
@@ -0,0 +1,114 @@
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Protocol
+
+from src.crud.login_attempt import LoginAttemptCRUD
+from src.database.session import async_session_global
+from src.exceptions import TooManyLoginAttempts
+from src.settings import settings
+
+
+class RateLimitBackend(Protocol):
+    async def hit(self, key: str, limit: int, window: int) -> bool:
+        """Records an attempt for `key` unless `limit` attempts were already
+        made in the last `window` seconds. Returns whether it was allowed."""
+        ...
+
+
+class InMemoryRateLimitBackend:
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._attempts: OrderedDict[str, deque[float]] = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: int) -> bool:
+        now = time.monotonic()
+        attempts = self._attempts.pop(key, None) or deque()
+        while attempts and attempts[0] <= now - window:
+            attempts.popleft()
+
+        allowed = len(attempts) < limit
+        if allowed:
+            attempts.append(now)
+        if attempts:
+            self._attempts[key] = attempts
+            while len(self._attempts) > self.max_keys:
+                self._attempts.popitem(last=False)
+        return allowed
+
+
+class PostgresRateLimitBackend:
+    """
+    Shares attempts between workers through the login_attempts table.
+
+    Attempts are written in their own transaction, so they are kept even when
+    the login request itself fails and rolls back. Concurrent attempts on the
+    same key are serialized with an advisory lock. Expired attempts of all
+    keys are pruned at most every `prune_interval` seconds per worker.
+    """
+
+    def __init__(self, prune_interval: int = 60) -> None:
+        self.prune_interval = prune_interval
+        self._pruned_at = float("-inf")
+
+    async def hit(self, key: str, limit: int, window: int) -> bool:
+        since = datetime.now(timezone.utc) - timedelta(seconds=window)
+        db = async_session_global()
+        try:
+            if time.monotonic() - self._pruned_at >= self.prune_interval:
+                self._pruned_at = time.monotonic()
+                await LoginAttemptCRUD.delete_expired_attempts(since, db)
+            await LoginAttemptCRUD.lock_key(key, db)
+            await LoginAttemptCRUD.delete_attempts(key, since, db)
+            allowed = await LoginAttemptCRUD.count_attempts(key, since, db) < limit
+            if allowed:
+                await LoginAttemptCRUD.add_attempt(key, db)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await db.close()
+        return allowed
+
+
+class LoginRateLimiter:
+    """Sliding-window limit of login attempts per source address and per account."""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        max_per_source: int,
+        max_per_account: int,
+        window: int,
+    ) -> None:
+        self.backend = backend
+        self.max_per_source = max_per_source
+        self.max_per_account = max_per_account
+        self.window = window
+
+    async def check(self, source: str, mail: str) -> None:
+        if not await self.backend.hit(
+            f"source:{source}", self.max_per_source, self.window
+        ):
+            raise TooManyLoginAttempts(retry_after=self.window)
+        if not await self.backend.hit(
+            f"account:{mail.lower()}", self.max_per_account, self.window
+        ):
+            raise TooManyLoginAttempts(retry_after=self.window)
+
+
+def get_rate_limit_backend(name: str) -> RateLimitBackend:
+    if name == "memory":
+        return InMemoryRateLimitBackend()
+    if name == "postgres":
+        return PostgresRateLimitBackend()
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+login_rate_limiter = LoginRateLimiter(
+    backend=get_rate_limit_backend(settings.LOGIN_RATE_LIMIT_BACKEND),
+    max_per_source=settings.LOGIN_MAX_ATTEMPTS_PER_SOURCE,
+    max_per_account=settings.LOGIN_MAX_ATTEMPTS_PER_ACCOUNT,
+    window=settings.LOGIN_RATE_LIMIT_WINDOW_SEC,
+)
@@ -0,0 +1,71 @@
+import time
+
+from src.settings import settings
+
+
+class RevocationSet:
+    """
+    Per-worker set of revoked token ids (`jti`) used by the stateless auth mode.
+
+    Every id is kept only until the token it belongs to expires. The set is
+    periodically replaced with the state stored in Postgres, so revocations
+    made by other workers become visible within `refresh_interval` seconds.
+    Ids added locally after a snapshot was read survive its replacement.
+    """
+
+    def __init__(self, refresh_interval: int) -> None:
+        self.refresh_interval = refresh_interval
+        self._revoked: dict[str, float] = {}
+        self._added_at: dict[str, float] = {}
+        self._last_refresh = float("-inf")
+
+    def add(self, jti: str, expires_at: float) -> None:
+        if expires_at > time.time():
+            self._revoked[jti] = expires_at
+            self._added_at[jti] = time.monotonic()
+
+    def is_revoked(self, jti: str) -> bool:
+        expires_at = self._revoked.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self._revoked[jti]
+            self._added_at.pop(jti, None)
+            return False
+        return True
+
+    def needs_refresh(self) -> bool:
+        return time.monotonic() - self._last_refresh >= self.refresh_interval
+
+    def mark_refreshed(self) -> None:
+        self._last_refresh = time.monotonic()
+
+    def replace(
+        self, revoked: dict[str, float], read_at: float = float("-inf")
+    ) -> None:
+        """
+        `read_at` is the `time.monotonic()` at which the snapshot `revoked` was
+        read, ids added after it might be missing from it and are kept.
+        """
+        now = time.time()
+        added_at = {
+            jti: added
+            for jti, added in self._added_at.items()
+            if added >= read_at and self._revoked[jti] > now
+        }
+        self._revoked = {
+            jti: expires_at for jti, expires_at in revoked.items() if expires_at > now
+        } | {jti: self._revoked[jti] for jti in added_at}
+        self._added_at = added_at
+        self.mark_refreshed()
+
+    def clear(self) -> None:
+        self._revoked.clear()
+        self._added_at.clear()
+        self._last_refresh = float("-inf")
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+revocation_set = RevocationSet(refresh_interval=settings.AUTH_REVOCATION_REFRESH_SEC)
@@ -0,0 +1,114 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.services.tag_scorer import normalize_tag
+from src.settings import settings
+
+Ranking = list[tuple[int, float]]
+
+
+@dataclass
+class CachedSearch:
+    ranking: Ranking
+    # False when the ranking was cut at a page boundary and more matches exist
+    complete: bool
+    expires_at: float
+
+
+class SearchCache:
+    """
+    In-process LRU cache of media search rankings.
+
+    Entries are keyed on the group and the normalized search term and hold the
+    ranked `(media_id, score)` pairs. The media CRUD drops the entries of a
+    group once a change to its media commits, other workers' writes show up
+    after `ttl` seconds at the latest.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[int, str], CachedSearch] = OrderedDict()
+        self._group_keys: dict[int, set[tuple[int, str]]] = {}
+
+    def get(self, group_id: int, term: str, top: int | None = None) -> Ranking | None:
+        """Cached ranking holding at least the `top` best matches, all if None."""
+        key = (group_id, normalize_tag(term))
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.time():
+            self._remove(key)
+            entry = None
+        if entry is None or not (
+            entry.complete or (top is not None and len(entry.ranking) >= top)
+        ):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.ranking
+
+    def set(
+        self,
+        group_id: int,
+        term: str,
+        ranking: Ranking,
+        complete: bool = True,
+        generation: int | None = None,
+    ) -> None:
+        # a ranking computed before an invalidation might already be stale
+        if self.max_size <= 0 or (
+            generation is not None and generation != self.generation
+        ):
+            return
+        key = (group_id, normalize_tag(term))
+        self._remove(key)
+        self._entries[key] = CachedSearch(
+            ranking=ranking, complete=complete, expires_at=time.time() + self.ttl
+        )
+        self._group_keys.setdefault(group_id, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_group(self, group_id: int) -> None:
+        self.generation += 1
+        for key in self._group_keys.pop(group_id, set()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.hits = 0
+        self.misses = 0
+        self._entries.clear()
+        self._group_keys.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, key: tuple[int, str]) -> None:
+        if self._entries.pop(key, None) is None:
+            return
+        keys = self._group_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._group_keys[key[0]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+search_cache = SearchCache(
+    max_size=settings.MEDIA_SEARCH_CACHE_SIZE,
+    ttl=settings.MEDIA_SEARCH_CACHE_TTL_SEC,
+)
@@ -0,0 +1,190 @@
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from src.services.tag_scorer import normalize_tag, score_tags
+from src.settings import settings
+
+NGRAM_SIZE = 2
+
+
+def ngrams(text: str, n: int = NGRAM_SIZE) -> set[str]:
+    # padded so that one and two character terms still produce grams
+    padded = f"\x02{text}\x03"
+    return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+
+class GroupTagIndex:
+    """
+    Inverted index of the tags of a single group.
+
+    Normalized tags map to the media carrying them and character n-grams map
+    to the tags containing them. A search only scores the tags sharing an
+    n-gram with the term, the rest of the group is never looked at.
+    """
+
+    def __init__(self) -> None:
+        self.built_at = time.monotonic()
+        self._media_tags: dict[int, frozenset[str]] = {}
+        self._tag_media: dict[str, set[int]] = {}
+        self._gram_tags: dict[str, set[str]] = {}
+        self.size = 0
+
+    def add(self, media_id: int, tags: Iterable[str]) -> None:
+        self.remove(media_id)
+        normalized = frozenset(normalize_tag(tag) for tag in tags)
+        self._media_tags[media_id] = normalized
+        for tag in normalized:
+            media_ids = self._tag_media.setdefault(tag, set())
+            if not media_ids:
+                for gram in ngrams(tag):
+                    self._gram_tags.setdefault(gram, set()).add(tag)
+            media_ids.add(media_id)
+        self.size += len(normalized) + 1
+
+    def remove(self, media_id: int) -> None:
+        tags = self._media_tags.pop(media_id, None)
+        if tags is None:
+            return
+        for tag in tags:
+            media_ids = self._tag_media[tag]
+            media_ids.discard(media_id)
+            if media_ids:
+                continue
+            del self._tag_media[tag]
+            for gram in ngrams(tag):
+                gram_tags = self._gram_tags[gram]
+                gram_tags.discard(tag)
+                if not gram_tags:
+                    del self._gram_tags[gram]
+        self.size -= len(tags) + 1
+
+    def candidate_tags(self, term: str) -> set[str]:
+        candidates: set[str] = set()
+        for gram in ngrams(normalize_tag(term)):
+            candidates.update(self._gram_tags.get(gram, ()))
+        return candidates
+
+    def score(self, term: str, threshold: float) -> dict[int, float]:
+        """Best tag score of every media with a tag scoring at least `threshold`."""
+        term = normalize_tag(term)
+        candidates = list(self.candidate_tags(term))
+        best: dict[int, float] = {}
+        for tag, score in zip(candidates, score_tags(term, candidates) / 100):
+            if score < threshold:
+                continue
+            for media_id in self._tag_media[tag]:
+                best[media_id] = max(best.get(media_id, 0.0), float(score))
+        return best
+
+    def search(self, term: str, threshold: float) -> set[int]:
+        return set(self.score(term, threshold))
+
+    def __contains__(self, media_id: int) -> bool:
+        return media_id in self._media_tags
+
+    def __len__(self) -> int:
+        return len(self._media_tags)
+
+
+class SearchIndex:
+    """
+    Process-local LRU of per-group tag indexes.
+
+    A group is indexed on its first search and kept up to date by the media
+    CRUD of this process as its writes commit. Writes made by other workers
+    become visible once the group is rebuilt after `ttl` seconds. The total
+    number of entries is bounded by `max_size`, cold groups are evicted first.
+
+    `generation` changes with every committed write, a build from rows read
+    before a write is returned but not kept.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+        self._groups: OrderedDict[int, GroupTagIndex] = OrderedDict()
+        self._size = 0
+
+    def get(self, group_id: int) -> GroupTagIndex | None:
+        index = self._groups.get(group_id)
+        if index is None:
+            return None
+        if time.monotonic() - index.built_at >= self.ttl:
+            self._discard(group_id)
+            return None
+        self._groups.move_to_end(group_id)
+        return index
+
+    def build(
+        self,
+        group_id: int,
+        media: Iterable[tuple[int, list[str]]],
+        generation: int | None = None,
+    ) -> GroupTagIndex:
+        index = GroupTagIndex()
+        for media_id, tags in media:
+            index.add(media_id, tags)
+        # rows read before a write might miss it
+        if self.max_size <= 0 or (
+            generation is not None and generation != self.generation
+        ):
+            return index
+        self._discard(group_id)
+        self._groups[group_id] = index
+        self._size += index.size
+        self._evict()
+        return index
+
+    def add_media(self, group_id: int, media_id: int, tags: list[str]) -> None:
+        self.generation += 1
+        index = self._groups.get(group_id)
+        if index is None:
+            return
+        self._size -= index.size
+        index.add(media_id, tags)
+        self._size += index.size
+        self._evict()
+
+    def remove_media(self, group_id: int, media_id: int) -> None:
+        self.generation += 1
+        index = self._groups.get(group_id)
+        if index is None:
+            return
+        self._size -= index.size
+        index.remove(media_id)
+        self._size += index.size
+
+    def invalidate_group(self, group_id: int) -> None:
+        self.generation += 1
+        self._discard(group_id)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._groups.clear()
+        self._size = 0
+
+    def _discard(self, group_id: int) -> None:
+        index = self._groups.pop(group_id, None)
+        if index is not None:
+            self._size -= index.size
+
+    def _evict(self) -> None:
+        # the most recently used group stays even if it alone exceeds the bound
+        while self._size > self.max_size and len(self._groups) > 1:
+            _, index = self._groups.popitem(last=False)
+            self._size -= index.size
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+
+search_index = SearchIndex(
+    max_size=settings.MEDIA_SEARCH_INDEX_SIZE,
+    ttl=settings.MEDIA_SEARCH_INDEX_TTL_SEC,
+)
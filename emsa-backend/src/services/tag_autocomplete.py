@@ -0,0 +1,139 @@
+import heapq
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Iterable
+
+from src.settings import settings
+
+# sorts after every character, so `prefix + PREFIX_END` bounds a prefix range
+PREFIX_END = "\U0010ffff"
+
+
+class GroupTagPrefixIndex:
+    """
+    Normalized tags of a single group kept in a sorted list, so the tags
+    starting with a prefix are one contiguous slice found with two bisections.
+    """
+
+    def __init__(self, tags: Iterable[tuple[str, int]] = ()) -> None:
+        self.built_at = time.monotonic()
+        self._counts = {name: count for name, count in tags if count > 0}
+        self._names = sorted(self._counts)
+
+    def update(self, name: str, delta: int) -> None:
+        count = self._counts.get(name, 0) + delta
+        if count > 0:
+            if name not in self._counts:
+                insort(self._names, name)
+            self._counts[name] = count
+        elif name in self._counts:
+            del self._counts[name]
+            del self._names[bisect_left(self._names, name)]
+
+    def complete(self, prefix: str, limit: int) -> list[tuple[str, int]]:
+        """The `limit` most used tags starting with `prefix`."""
+        start = bisect_left(self._names, prefix)
+        end = bisect_left(self._names, prefix + PREFIX_END, start)
+        names = heapq.nsmallest(
+            limit,
+            self._names[start:end],
+            key=lambda name: (-self._counts[name], name),
+        )
+        return [(name, self._counts[name]) for name in names]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class TagAutocomplete:
+    """
+    Process-local LRU of per-group prefix indexes.
+
+    A group is loaded from the tag dictionary on its first lookup and kept up
+    to date by the tag CRUD of this process as its writes commit. Writes made
+    by other workers become visible once the group is reloaded after `ttl`
+    seconds. The total number of tags held is bounded by `max_size`.
+
+    `generation` changes with every committed write, an index loaded before a
+    write is returned but not kept.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+        self._groups: OrderedDict[int, GroupTagPrefixIndex] = OrderedDict()
+        self._size = 0
+
+    def get(self, group_id: int) -> GroupTagPrefixIndex | None:
+        index = self._groups.get(group_id)
+        if index is None:
+            return None
+        if time.monotonic() - index.built_at >= self.ttl:
+            self._discard(group_id)
+            return None
+        self._groups.move_to_end(group_id)
+        return index
+
+    def build(
+        self,
+        group_id: int,
+        tags: Iterable[tuple[str, int]],
+        generation: int | None = None,
+    ) -> GroupTagPrefixIndex:
+        index = GroupTagPrefixIndex(tags)
+        # tags read before a write might miss it
+        if self.max_size <= 0 or (
+            generation is not None and generation != self.generation
+        ):
+            return index
+        self._discard(group_id)
+        self._groups[group_id] = index
+        self._size += len(index)
+        self._evict()
+        return index
+
+    def update(self, group_id: int, names: Iterable[str], delta: int) -> None:
+        self.generation += 1
+        index = self._groups.get(group_id)
+        if index is None:
+            return
+        self._size -= len(index)
+        for name in names:
+            index.update(name, delta)
+        self._size += len(index)
+        self._evict()
+
+    def invalidate_group(self, group_id: int) -> None:
+        self.generation += 1
+        self._discard(group_id)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._groups.clear()
+        self._size = 0
+
+    def _discard(self, group_id: int) -> None:
+        index = self._groups.pop(group_id, None)
+        if index is not None:
+            self._size -= len(index)
+
+    def _evict(self) -> None:
+        # the most recently used group stays even if it alone exceeds the bound
+        while self._size > self.max_size and len(self._groups) > 1:
+            _, index = self._groups.popitem(last=False)
+            self._size -= len(index)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+
+tag_autocomplete = TagAutocomplete(
+    max_size=settings.TAG_AUTOCOMPLETE_SIZE,
+    ttl=settings.TAG_AUTOCOMPLETE_TTL_SEC,
+)
@@ -1,8 +1,15 @@
+from functools import lru_cache
 from urllib.parse import urlparse
 
+from src.services.tag_stats import GroupTagStats
+from src.settings import settings
+
 KNOWN_DOMAINS = ["tiktok", "instagram", "reddit"]
+# bulk imports repeat the same links and names, parsing them once is enough
+PARSE_CACHE_SIZE = 4096
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def propose_tag_from_link(link: str) -> str | None:
     parsed_url = urlparse(link)
     words = parsed_url.netloc.split(".")
@@ -17,7 +24,58 @@ def propose_tag_from_link(link: str) -> str | None:
     return tag
 
 
-def propose_tags_from_name(name: str) -> list:
-    tags = name.split()
-    lowercase_tags = [tag.lower() for tag in tags]
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _tokenize(name: str) -> tuple[str, ...]:
+    return tuple(tag.lower() for tag in name.split())
+
+
+def propose_tags_from_name(name: str, stats: GroupTagStats | None = None) -> list:
+    lowercase_tags = list(_tokenize(name))
+    if stats is not None:
+        lowercase_tags.extend(propose_group_tags(lowercase_tags, stats))
     return lowercase_tags
+
+
+def propose_tags(
+    name: str, is_image: bool, link: str = "", stats: GroupTagStats | None = None
+) -> list[str]:
+    """Tags from the name, the link domain and, with `stats`, the group's tags."""
+    tags = propose_tags_from_name(name)
+    if not is_image:
+        tag = propose_tag_from_link(link)
+        tags.append(tag) if tag else None
+    if stats is not None:
+        tags.extend(propose_group_tags(tags, stats))
+    return tags
+
+
+def propose_group_tags(
+    tags: list[str],
+    stats: GroupTagStats,
+    limit: int | None = None,
+    min_confidence: float | None = None,
+) -> list[str]:
+    """
+    Tags the group uses together with the proposed ones, most likely first.
+
+    A candidate's confidence is the largest share of media carrying one of
+    the proposed tags that also carry the candidate. Only the precomputed top
+    partners of every proposed tag are looked at.
+    """
+    if limit is None:
+        limit = settings.TAG_PROPOSER_MAX_SUGGESTIONS
+    if min_confidence is None:
+        min_confidence = settings.TAG_PROPOSER_MIN_CONFIDENCE
+
+    proposed = set(tags)
+    confidence: dict[str, float] = {}
+    for tag in proposed:
+        for other, share in stats.related(tag):
+            if other not in proposed and share > confidence.get(other, 0.0):
+                confidence[other] = share
+
+    candidates = sorted(
+        (tag for tag, share in confidence.items() if share >= min_confidence),
+        key=lambda tag: (-confidence[tag], -stats.frequency[tag], tag),
+    )
+    return candidates[:limit]
@@ -0,0 +1,77 @@
+from typing import Iterable, Sequence
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from src.settings import settings
+
+
+def normalize_tag(tag: str) -> str:
+    return tag.lower()
+
+
+def _workers(size: int) -> int:
+    if size >= settings.MEDIA_SEARCH_PARALLEL_MIN_TAGS:
+        return settings.MEDIA_SEARCH_WORKERS
+    return 1
+
+
+def score_tags(term: str, vocabulary: Sequence[str]) -> np.ndarray:
+    """
+    `fuzz.ratio` of the term against every tag of the vocabulary in one call,
+    rounded to whole percents like fuzzywuzzy does.
+    """
+    if not vocabulary:
+        return np.empty(0)
+    scores = process.cdist(
+        [term],
+        vocabulary,
+        scorer=fuzz.ratio,
+        dtype=np.float64,
+        workers=_workers(len(vocabulary)),
+    )
+    return np.rint(scores[0])
+
+
+def score_names(term: str, names: Sequence[str]) -> np.ndarray:
+    """`fuzz.partial_ratio` of the term against every name, between 0 and 1."""
+    if not names:
+        return np.empty(0)
+    scores = process.cdist(
+        [normalize_tag(term)],
+        [normalize_tag(name or "") for name in names],
+        scorer=fuzz.partial_ratio,
+        dtype=np.float64,
+        workers=_workers(len(names)),
+    )
+    return scores[0] / 100
+
+
+class TagTable:
+    """
+    Tag vocabulary of a list of media together with the table mapping every
+    tag back to the media carrying it, so a search scores each distinct tag
+    once and resolves the matches with array lookups.
+    """
+
+    def __init__(self, media_tags: Sequence[Iterable[str]]) -> None:
+        vocabulary: dict[str, int] = {}
+        media_positions: list[int] = []
+        tag_positions: list[int] = []
+        for position, tags in enumerate(media_tags):
+            for tag in tags:
+                tag = normalize_tag(tag)
+                tag_positions.append(vocabulary.setdefault(tag, len(vocabulary)))
+                media_positions.append(position)
+
+        self.vocabulary = list(vocabulary)
+        self.media_count = len(media_tags)
+        self._media_positions = np.array(media_positions, dtype=np.intp)
+        self._tag_positions = np.array(tag_positions, dtype=np.intp)
+
+    def best_scores(self, term: str) -> np.ndarray:
+        """Best tag score of every media between 0 and 1, 0 for untagged ones."""
+        tag_scores = score_tags(normalize_tag(term), self.vocabulary) / 100
+        best = np.zeros(self.media_count)
+        np.maximum.at(best, self._media_positions, tag_scores[self._tag_positions])
+        return best
@@ -0,0 +1,172 @@
+import heapq
+import time
+from collections import Counter, OrderedDict
+from typing import Iterable
+
+from src.settings import settings
+
+# number of co-occurring tags kept ready per tag
+RELATED_TAGS = 10
+
+
+class GroupTagStats:
+    """
+    Usage statistics of the tags of a single group: how many media carry
+    every tag and how many carry every pair of tags together.
+
+    `related` answers from a per-tag list of the most common partners that is
+    only recomputed after a write touching that tag.
+    """
+
+    def __init__(self, media_tags: Iterable[Iterable[str]] = ()) -> None:
+        self.built_at = time.monotonic()
+        self.frequency: Counter[str] = Counter()
+        self.cooccurrence: dict[str, Counter[str]] = {}
+        self._related: dict[str, list[tuple[str, float]]] = {}
+        self.size = 0
+        for tags in media_tags:
+            self.add(tags)
+
+    def add(self, tags: Iterable[str]) -> None:
+        self._update(set(tags), 1)
+
+    def remove(self, tags: Iterable[str]) -> None:
+        self._update(set(tags), -1)
+
+    def _update(self, tags: set[str], delta: int) -> None:
+        for tag in tags:
+            self._related.pop(tag, None)
+            self.size -= tag in self.frequency
+            self.frequency[tag] += delta
+            if self.frequency[tag] > 0:
+                self.size += 1
+            else:
+                del self.frequency[tag]
+
+            partners = self.cooccurrence.setdefault(tag, Counter())
+            self.size -= len(partners)
+            for other in tags - {tag}:
+                partners[other] += delta
+                if partners[other] <= 0:
+                    del partners[other]
+            self.size += len(partners)
+            if not partners:
+                del self.cooccurrence[tag]
+
+    def related(self, tag: str) -> list[tuple[str, float]]:
+        """
+        Tags most often used together with `tag` and the share of its media
+        carrying them.
+        """
+        related = self._related.get(tag)
+        if related is None:
+            count = self.frequency.get(tag, 0)
+            partners = self.cooccurrence.get(tag, Counter())
+            top = heapq.nsmallest(
+                RELATED_TAGS, partners.items(), key=lambda item: (-item[1], item[0])
+            )
+            related = [(other, together / count) for other, together in top]
+            self._related[tag] = related
+        return related
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self.frequency
+
+
+class TagStatsCache:
+    """
+    Process-local LRU of per-group tag statistics.
+
+    A group is loaded from the tag dictionary on its first use and kept up to
+    date by the tag CRUD of this process as its writes commit. Writes made by
+    other workers become visible once the group is reloaded after `ttl`
+    seconds. The total number of tags and tag pairs held is bounded by
+    `max_size`.
+
+    `generation` changes with every committed write, statistics loaded before
+    a write are returned but not kept.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+        self._groups: OrderedDict[int, GroupTagStats] = OrderedDict()
+        self._size = 0
+
+    def get(self, group_id: int) -> GroupTagStats | None:
+        stats = self._groups.get(group_id)
+        if stats is None:
+            return None
+        if time.monotonic() - stats.built_at >= self.ttl:
+            self._discard(group_id)
+            return None
+        self._groups.move_to_end(group_id)
+        return stats
+
+    def build(
+        self,
+        group_id: int,
+        media_tags: Iterable[Iterable[str]],
+        generation: int | None = None,
+    ) -> GroupTagStats:
+        stats = GroupTagStats(media_tags)
+        # tags read before a write might miss it
+        if self.max_size <= 0 or (
+            generation is not None and generation != self.generation
+        ):
+            return stats
+        self._discard(group_id)
+        self._groups[group_id] = stats
+        self._size += stats.size
+        self._evict()
+        return stats
+
+    def add_media(self, group_id: int, tags: Iterable[str]) -> None:
+        self._apply(group_id, tags, GroupTagStats.add)
+
+    def remove_media(self, group_id: int, tags: Iterable[str]) -> None:
+        self._apply(group_id, tags, GroupTagStats.remove)
+
+    def _apply(self, group_id: int, tags: Iterable[str], update) -> None:
+        self.generation += 1
+        stats = self._groups.get(group_id)
+        if stats is None:
+            return
+        self._size -= stats.size
+        update(stats, tags)
+        self._size += stats.size
+        self._evict()
+
+    def invalidate_group(self, group_id: int) -> None:
+        self.generation += 1
+        self._discard(group_id)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._groups.clear()
+        self._size = 0
+
+    def _discard(self, group_id: int) -> None:
+        stats = self._groups.pop(group_id, None)
+        if stats is not None:
+            self._size -= stats.size
+
+    def _evict(self) -> None:
+        # the most recently used group stays even if it alone exceeds the bound
+        while self._size > self.max_size and len(self._groups) > 1:
+            _, stats = self._groups.popitem(last=False)
+            self._size -= stats.size
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+
+tag_stats = TagStatsCache(
+    max_size=settings.TAG_STATS_SIZE,
+    ttl=settings.TAG_STATS_TTL_SEC,
+)
@@ -0,0 +1,106 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.database.schemas import PrivateUser
+from src.settings import settings
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+@dataclass
+class CachedToken:
+    user: PrivateUser
+    expires_at: float
+
+
+class TokenCache:
+    """
+    In-process LRU cache of verified access tokens.
+
+    Entries are keyed on the token hash and expire after `ttl` seconds or when
+    the token itself expires, whichever comes first. Every user has its own
+    generation, so invalidating one user does not keep the tokens of the others
+    from being cached.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._counter = 0
+        self._cleared = 0
+        self._generations: dict[str, int] = {}
+        self._entries: OrderedDict[str, CachedToken] = OrderedDict()
+        self._user_keys: dict[str, set[str]] = {}
+
+    def generation(self, user_mail: str) -> int:
+        return self._generations.get(user_mail, self._cleared)
+
+    def get(self, token: str) -> PrivateUser | None:
+        key = hash_token(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.time():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.user
+
+    def set(
+        self,
+        token: str,
+        user: PrivateUser,
+        token_expires_at: float | None = None,
+        generation: int | None = None,
+    ) -> None:
+        # a token verified before an invalidation might already be stale
+        if self.max_size <= 0 or (
+            generation is not None and generation != self.generation(user.mail)
+        ):
+            return
+        expires_at = time.time() + self.ttl
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+
+        key = hash_token(token)
+        self._remove(key)
+        self._entries[key] = CachedToken(user=user, expires_at=expires_at)
+        self._user_keys.setdefault(user.mail, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_mail: str) -> None:
+        self._counter += 1
+        self._generations[user_mail] = self._counter
+        for key in self._user_keys.pop(user_mail, set()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._counter += 1
+        self._cleared = self._counter
+        self._generations.clear()
+        self._entries.clear()
+        self._user_keys.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._user_keys.get(entry.user.mail)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[entry.user.mail]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(
+    max_size=settings.AUTH_TOKEN_CACHE_SIZE,
+    ttl=settings.AUTH_TOKEN_CACHE_TTL_SEC,
+)
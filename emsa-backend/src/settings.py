@@ -10,6 +10,19 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = Field(..., validation_alias="POSTGRES_HOST")
     POSTGRES_PORT: int = Field(..., validation_alias="POSTGRES_PORT")
     POSTGRES_DB: str = Field(..., validation_alias="POSTGRES_DB")
+    POSTGRES_READ_HOST: str | None = Field(None, validation_alias="POSTGRES_READ_HOST")
+    POSTGRES_READ_PORT: int | None = Field(None, validation_alias="POSTGRES_READ_PORT")
+
+    DB_ECHO: bool = Field(False, validation_alias="DB_ECHO")
+    DB_POOL_SIZE: int = Field(5, validation_alias="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(10, validation_alias="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: float = Field(30, validation_alias="DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: int = Field(-1, validation_alias="DB_POOL_RECYCLE")
+    DB_POOL_PRE_PING: bool = Field(False, validation_alias="DB_POOL_PRE_PING")
+    DB_READ_AUTOCOMMIT: bool = Field(True, validation_alias="DB_READ_AUTOCOMMIT")
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        100, validation_alias="DB_STATEMENT_CACHE_SIZE"
+    )
 
     GCP_SERVICE_ACCOUNT_FILEPATH: str = Field(
         ..., validation_alias="GCP_SERVICE_ACCOUNT_FILEPATH"
@@ -18,6 +31,93 @@ class Settings(BaseSettings):
     AUTH_SECRET_KEY: str = Field(..., validation_alias="AUTH_SECRET_KEY")
     AUTH_ALGORITHM: str = Field(..., validation_alias="AUTH_ALGORITHM")
     AUTH_TOKEN_EXPIRE_MIN: int = Field(..., validation_alias="AUTH_TOKEN_EXPIRE_MIN")
+    AUTH_TOKEN_CACHE_SIZE: int = Field(10_000, validation_alias="AUTH_TOKEN_CACHE_SIZE")
+    AUTH_TOKEN_CACHE_TTL_SEC: int = Field(
+        60, validation_alias="AUTH_TOKEN_CACHE_TTL_SEC"
+    )
+    AUTH_REFRESH_TOKEN_EXPIRE_DAYS: int = Field(
+        30, validation_alias="AUTH_REFRESH_TOKEN_EXPIRE_DAYS"
+    )
+    AUTH_STATELESS: bool = Field(False, validation_alias="AUTH_STATELESS")
+    AUTH_REVOCATION_REFRESH_SEC: int = Field(
+        30, validation_alias="AUTH_REVOCATION_REFRESH_SEC"
+    )
+
+    LOGIN_RATE_LIMIT_BACKEND: str = Field(
+        "memory", validation_alias="LOGIN_RATE_LIMIT_BACKEND"
+    )
+    LOGIN_RATE_LIMIT_WINDOW_SEC: int = Field(
+        60, validation_alias="LOGIN_RATE_LIMIT_WINDOW_SEC"
+    )
+    LOGIN_MAX_ATTEMPTS_PER_SOURCE: int = Field(
+        30, validation_alias="LOGIN_MAX_ATTEMPTS_PER_SOURCE"
+    )
+    LOGIN_MAX_ATTEMPTS_PER_ACCOUNT: int = Field(
+        10, validation_alias="LOGIN_MAX_ATTEMPTS_PER_ACCOUNT"
+    )
+
+    PASSWORD_HASH_WORKERS: int = Field(2, validation_alias="PASSWORD_HASH_WORKERS")
+    PASSWORD_HASH_QUEUE_SIZE: int = Field(
+        64, validation_alias="PASSWORD_HASH_QUEUE_SIZE"
+    )
+    SCRYPT_N: int = Field(32768, validation_alias="SCRYPT_N")
+    SCRYPT_R: int = Field(8, validation_alias="SCRYPT_R")
+    SCRYPT_P: int = Field(1, validation_alias="SCRYPT_P")
+
+    # group content pages, a request asking for more than the cap is rejected
+    MEDIA_PAGE_SIZE: int = Field(50, validation_alias="MEDIA_PAGE_SIZE")
+    MEDIA_PAGE_MAX_SIZE: int = Field(200, validation_alias="MEDIA_PAGE_MAX_SIZE")
+    MEDIA_SEARCH_ENGINE: str = Field("python", validation_alias="MEDIA_SEARCH_ENGINE")
+    MEDIA_SEARCH_THRESHOLD: float = Field(
+        0.65, validation_alias="MEDIA_SEARCH_THRESHOLD"
+    )
+    MEDIA_SEARCH_NAME_WEIGHT: float = Field(
+        0.5, validation_alias="MEDIA_SEARCH_NAME_WEIGHT"
+    )
+    MEDIA_SEARCH_INDEX_SIZE: int = Field(
+        500_000, validation_alias="MEDIA_SEARCH_INDEX_SIZE"
+    )
+    MEDIA_SEARCH_INDEX_TTL_SEC: int = Field(
+        300, validation_alias="MEDIA_SEARCH_INDEX_TTL_SEC"
+    )
+    MEDIA_SEARCH_CACHE_SIZE: int = Field(
+        10_000, validation_alias="MEDIA_SEARCH_CACHE_SIZE"
+    )
+    MEDIA_SEARCH_CACHE_TTL_SEC: int = Field(
+        60, validation_alias="MEDIA_SEARCH_CACHE_TTL_SEC"
+    )
+    TAG_AUTOCOMPLETE_SIZE: int = Field(
+        200_000, validation_alias="TAG_AUTOCOMPLETE_SIZE"
+    )
+    TAG_AUTOCOMPLETE_TTL_SEC: int = Field(
+        300, validation_alias="TAG_AUTOCOMPLETE_TTL_SEC"
+    )
+    TAG_STATS_SIZE: int = Field(500_000, validation_alias="TAG_STATS_SIZE")
+    TAG_STATS_TTL_SEC: int = Field(300, validation_alias="TAG_STATS_TTL_SEC")
+    TAG_PROPOSER_MAX_SUGGESTIONS: int = Field(
+        5, validation_alias="TAG_PROPOSER_MAX_SUGGESTIONS"
+    )
+    TAG_PROPOSER_MIN_CONFIDENCE: float = Field(
+        0.3, validation_alias="TAG_PROPOSER_MIN_CONFIDENCE"
+    )
+    TAG_PROPOSER_MAX_BATCH_SIZE: int = Field(
+        1000, validation_alias="TAG_PROPOSER_MAX_BATCH_SIZE"
+    )
+    # tag vocabularies at least this large are scored on MEDIA_SEARCH_WORKERS
+    # threads, -1 uses every core
+    MEDIA_SEARCH_WORKERS: int = Field(1, validation_alias="MEDIA_SEARCH_WORKERS")
+    MEDIA_SEARCH_PARALLEL_MIN_TAGS: int = Field(
+        10_000, validation_alias="MEDIA_SEARCH_PARALLEL_MIN_TAGS"
+    )
+    # pg_trgm.strict_word_similarity_threshold of the server, the trigram
+    # indexes can only prefilter searches with a threshold at or above it
+    PG_TRGM_WORD_SIMILARITY_THRESHOLD: float = Field(
+        0.5, validation_alias="PG_TRGM_WORD_SIMILARITY_THRESHOLD"
+    )
+
+    @property
+    def PASSWORD_HASH_METHOD(self) -> str:
+        return f"scrypt:{self.SCRYPT_N}:{self.SCRYPT_R}:{self.SCRYPT_P}"
 
     @property
     def DATABASE_URL(self) -> str:
@@ -28,5 +128,17 @@ class Settings(BaseSettings):
             f"{self.POSTGRES_DB}"
         )
 
+    @property
+    def READ_DATABASE_URL(self) -> str | None:
+        if not self.POSTGRES_READ_HOST:
+            return None
+        return (
+            f"postgresql+asyncpg://"
+            f"{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@"
+            f"{self.POSTGRES_READ_HOST}:"
+            f"{self.POSTGRES_READ_PORT or self.POSTGRES_PORT}/"
+            f"{self.POSTGRES_DB}"
+        )
+
 
 settings = Settings()
@@ -25,8 +25,15 @@ from src.database.schemas import (
     MediaGet,
     PrivateUser,
 )
-from src.database.session import Base, engine, get_db
+from src.database.session import Base, engine, get_db, get_read_db
 from src.routes import group, health_check, media, user
+from src.services.rate_limiter import InMemoryRateLimitBackend, login_rate_limiter
+from src.services.revocation_set import revocation_set
+from src.services.search_cache import search_cache
+from src.services.search_index import search_index
+from src.services.tag_autocomplete import tag_autocomplete
+from src.services.tag_stats import tag_stats
+from src.services.token_cache import token_cache
 from src.settings import settings
 
 USER_1 = PrivateUser(mail="abc@gmail.com", name="Dominik", password_hash="321fdas532")
@@ -129,6 +136,33 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_state():
+    token_cache.clear()
+    revocation_set.clear()
+    yield
+    token_cache.clear()
+    revocation_set.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_search_index():
+    search_index.clear()
+    search_cache.clear()
+    tag_autocomplete.clear()
+    tag_stats.clear()
+    yield
+    search_index.clear()
+    search_cache.clear()
+    tag_autocomplete.clear()
+    tag_stats.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_login_rate_limiter(monkeypatch):
+    monkeypatch.setattr(login_rate_limiter, "backend", InMemoryRateLimitBackend())
+
+
 @pytest_asyncio.fixture(scope="function")
 async def db_session(async_db_connection) -> AsyncGenerator[AsyncSession, None]:
     async for session in __session_within_transaction(async_db_connection):
@@ -139,13 +173,14 @@ async def db_session(async_db_connection) -> AsyncGenerator[AsyncSession, None]:
 async def client(
     app: FastAPI, db_session: AsyncSession
 ) -> AsyncGenerator[AsyncClient, None]:
-    def _get_test_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    async def _get_test_db():
+        yield db_session
+        # commits like get_db so that the after commit hooks run, the data is
+        # still rolled back with the outer transaction
+        await db_session.commit()
 
     app.dependency_overrides[get_db] = _get_test_db
+    app.dependency_overrides[get_read_db] = _get_test_db
     async with AsyncClient(app=app, base_url="http://localhost:8000") as client:
         yield client
 
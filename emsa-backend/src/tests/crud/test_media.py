@@ -1,10 +1,18 @@
 import pytest
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+import pytest_asyncio
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.crud.media import MediaCRUD
 from src.database.models import Media
 from src.database.schemas import MediaCreate, MediaGet, MediaQuery, MediaUpdate
+from src.database.trigram import (
+    CREATE_EXTENSION,
+    CREATE_MEDIA_TAGS_TEXT,
+    is_trigram_search_installed,
+)
+from src.services.search_cache import search_cache
+from src.settings import settings
 from src.tests.conftest import MEDIA_DATA_1, TAGS_1
 
 
@@ -92,9 +100,10 @@ async def test_get_media_by_group(
 ):
     group_id = two_media_on_groups[0].group_id
     another_media = MediaCreate(**{"group_id": group_id, **MEDIA_DATA_1})
+    # newest first
     expected_media = [
-        two_media_on_groups[0],
         await MediaCRUD.create_media(another_media, db_session),
+        two_media_on_groups[0],
     ]
 
     media_list = await MediaCRUD.get_media_by_group(group_id, db_session)
@@ -116,3 +125,321 @@ async def test_get_media_with_search(
     media_list = await MediaCRUD.get_media_by_group(group_id, db_session, query)
 
     assert len(media_list) == 1
+
+
+@pytest_asyncio.fixture(scope="function")
+async def trigram_search(db_session: AsyncSession):
+    available = await db_session.execute(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    )
+    if available.scalar() is None:
+        pytest.skip("pg_trgm extension is not available")
+    # rolled back together with the rest of the test transaction
+    await db_session.execute(text(CREATE_EXTENSION))
+    await db_session.execute(text(CREATE_MEDIA_TAGS_TEXT))
+
+
+@pytest.mark.asyncio
+async def test_trigram_search_is_installed(db_session: AsyncSession, trigram_search):
+    assert await is_trigram_search_installed(await db_session.connection())
+
+
+@pytest.mark.parametrize(
+    "search, expected_names",
+    [
+        ("bike", ["Old but funny"]),
+        ("FUNNY", ["Old but funny", "Old tiktok star"]),
+        ("tiktok", ["Old tiktok star"]),
+        ("nothing", []),
+    ],
+)
+@pytest.mark.asyncio
+async def test_search_media(
+    search, expected_names, db_session: AsyncSession, advanced_use_case, trigram_search
+):
+    group_id = advanced_use_case["group_ids"][0]
+
+    media_list = await MediaCRUD.search_media(group_id, search, db_session)
+
+    assert [media.name for media in media_list] == expected_names
+
+
+@pytest.mark.asyncio
+async def test_search_media_orders_by_relevance(
+    db_session: AsyncSession, two_groups, trigram_search
+):
+    group_id = two_groups[0].id
+    for name, tags in [("plural", ["bikes"]), ("exact", ["bike"]), ("other", ["car"])]:
+        await MediaCRUD.create_media(
+            MediaCreate(group_id=group_id, is_image=True, name=name, tags=tags),
+            db_session,
+        )
+
+    media_list = await MediaCRUD.search_media(
+        group_id, "Bike", db_session, similarity_threshold=0.5
+    )
+
+    assert [media.name for media in media_list] == ["exact", "plural"]
+
+
+@pytest.mark.asyncio
+async def test_get_media_by_group_with_postgres_engine(
+    db_session: AsyncSession, advanced_use_case, trigram_search, monkeypatch
+):
+    monkeypatch.setattr(settings, "MEDIA_SEARCH_ENGINE", "postgres")
+    group_id = advanced_use_case["group_ids"][0]
+
+    media_list = await MediaCRUD.get_media_by_group(
+        group_id, db_session, MediaQuery(search_term="bike")
+    )
+
+    assert [media.name for media in media_list] == ["Old but funny"]
+
+
+@pytest.mark.parametrize("search", ["Bike", "bi", "funy", "FALL", "adventure", "x"])
+@pytest.mark.asyncio
+async def test_get_media_by_group_with_index_engine(
+    search, db_session: AsyncSession, advanced_use_case, monkeypatch
+):
+    group_id = advanced_use_case["group_ids"][0]
+    query = MediaQuery(search_term=search)
+    expected = await MediaCRUD.get_media_by_group(group_id, db_session, query)
+
+    monkeypatch.setattr(settings, "MEDIA_SEARCH_ENGINE", "index")
+    media_list = await MediaCRUD.get_media_by_group(group_id, db_session, query)
+
+    assert [media.model_dump() for media in media_list] == [
+        media.model_dump() for media in expected
+    ]
+
+
+@pytest.mark.asyncio
+async def test_index_engine_follows_media_changes(
+    db_session: AsyncSession, two_media_on_groups: list[MediaGet], monkeypatch
+):
+    monkeypatch.setattr(settings, "MEDIA_SEARCH_ENGINE", "index")
+    group_id = two_media_on_groups[0].group_id
+    query = MediaQuery(search_term="bike")
+    assert len(await MediaCRUD.get_media_by_group(group_id, db_session, query)) == 1
+
+    created = await MediaCRUD.create_media(
+        MediaCreate(group_id=group_id, is_image=True, tags=["bikes"]), db_session
+    )
+    await db_session.commit()
+    media_list = await MediaCRUD.get_media_by_group(group_id, db_session, query)
+    assert [media.id for media in media_list] == [two_media_on_groups[0].id, created.id]
+
+    await MediaCRUD.delete_media_from_db(two_media_on_groups[0].id, db_session)
+    await db_session.commit()
+    media_list = await MediaCRUD.get_media_by_group(group_id, db_session, query)
+    assert [media.id for media in media_list] == [created.id]
+
+
+@pytest.mark.parametrize("engine", ["python", "index"])
+@pytest.mark.asyncio
+async def test_search_pages_match_full_ranking(
+    engine, db_session: AsyncSession, two_groups, monkeypatch
+):
+    monkeypatch.setattr(settings, "MEDIA_SEARCH_ENGINE", engine)
+    group_id = two_groups[0].id
+    for name, tags in [
+        ("bike", ["bike"]),
+        ("", ["bikes"]),
+        ("", ["bike"]),
+        ("", ["bike", "car"]),
+        ("", ["car"]),
+    ]:
+        await MediaCRUD.create_media(
+            MediaCreate(group_id=group_id, is_image=True, name=name, tags=tags),
+            db_session,
+        )
+
+    ranked = await MediaCRUD.get_media_by_group(
+        group_id, db_session, MediaQuery(search_term="bike")
+    )
+    page = await MediaCRUD.get_media_by_group(
+        group_id, db_session, MediaQuery(search_term="bike", limit=2, offset=1)
+    )
+
+    assert [media.score for media in ranked] == sorted(
+        (media.score for media in ranked), reverse=True
+    )
+    # the named one ranks first, equal scores are ordered newest first
+    assert ranked[0].name == "bike"
+    assert ranked[1].id > ranked[2].id
+    assert len(ranked) == 4
+    assert [media.id for media in page] == [media.id for media in ranked[1:3]]
+
+
+@pytest.mark.asyncio
+async def test_repeated_search_is_served_from_cache(
+    db_session: AsyncSession, two_media_on_groups: list[MediaGet], monkeypatch
+):
+    group_id = two_media_on_groups[0].group_id
+    query = MediaQuery(search_term="funy")
+    expected = await MediaCRUD.get_media_by_group(group_id, db_session, query)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("search ran again")
+
+    monkeypatch.setattr(MediaCRUD, "search_media_scan", fail)
+    cached = await MediaCRUD.get_media_by_group(
+        group_id, db_session, MediaQuery(search_term="FUNY")
+    )
+
+    assert cached == expected
+    assert search_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_cache_follows_media_changes(
+    db_session: AsyncSession, two_media_on_groups: list[MediaGet]
+):
+    group_id = two_media_on_groups[0].group_id
+    query = MediaQuery(search_term="bike")
+    assert len(await MediaCRUD.get_media_by_group(group_id, db_session, query)) == 1
+
+    created = await MediaCRUD.create_media(
+        MediaCreate(group_id=group_id, is_image=True, tags=["bikes"]), db_session
+    )
+    await db_session.commit()
+    media_list = await MediaCRUD.get_media_by_group(group_id, db_session, query)
+    assert {media.id for media in media_list} == {
+        two_media_on_groups[0].id,
+        created.id,
+    }
+
+    await MediaCRUD.delete_media_from_db(created.id, db_session)
+    await db_session.commit()
+    media_list = await MediaCRUD.get_media_by_group(group_id, db_session, query)
+    assert [media.id for media in media_list] == [two_media_on_groups[0].id]
+    assert search_cache.stats()["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_search_cache_extends_partial_rankings(
+    db_session: AsyncSession, two_groups
+):
+    group_id = two_groups[0].id
+    for _ in range(4):
+        await MediaCRUD.create_media(
+            MediaCreate(group_id=group_id, is_image=True, tags=["bike"]), db_session
+        )
+
+    first = await MediaCRUD.get_media_by_group(
+        group_id, db_session, MediaQuery(search_term="bike", limit=2)
+    )
+    again = await MediaCRUD.get_media_by_group(
+        group_id, db_session, MediaQuery(search_term="bike", limit=1, offset=1)
+    )
+    rest = await MediaCRUD.get_media_by_group(
+        group_id, db_session, MediaQuery(search_term="bike", limit=2, offset=2)
+    )
+
+    assert again == first[1:]
+    assert len({media.id for media in first + rest}) == 4
+    assert (search_cache.stats()["hits"], search_cache.stats()["misses"]) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_get_media_page(db_session: AsyncSession, two_groups):
+    group_id = two_groups[0].id
+    created = [
+        await MediaCRUD.create_media(
+            MediaCreate(group_id=group_id, is_image=True, name=str(i)), db_session
+        )
+        for i in range(5)
+    ]
+
+    pages = []
+    cursor = None
+    while True:
+        page = await MediaCRUD.get_media_page(
+            group_id, db_session, limit=2, cursor=cursor
+        )
+        pages.append([media.id for media in page.items])
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    # rows created in one transaction share created_at, the id breaks the tie
+    ids = [media.id for media in reversed(created)]
+    assert pages == [ids[0:2], ids[2:4], ids[4:]]
+
+
+@pytest.mark.asyncio
+async def test_get_media_page_last_page_has_no_cursor(
+    db_session: AsyncSession, two_media_on_groups: list[MediaGet]
+):
+    page = await MediaCRUD.get_media_page(
+        two_media_on_groups[0].group_id, db_session, limit=1
+    )
+
+    assert [media.id for media in page.items] == [two_media_on_groups[0].id]
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_get_media_page_group_not_found(db_session: AsyncSession):
+    with pytest.raises(ValueError):
+        await MediaCRUD.get_media_page(0, db_session)
+
+
+@pytest.fixture
+def statements(async_db_connection: AsyncConnection) -> list[str]:
+    executed = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    sync_engine = async_db_connection.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    yield executed
+    event.remove(sync_engine, "before_cursor_execute", capture)
+
+
+@pytest.mark.parametrize(
+    "query", [None, MediaQuery(search_term="bike"), MediaQuery(fields=["id"])]
+)
+@pytest.mark.asyncio
+async def test_get_media_by_group_runs_one_statement(
+    query, db_session: AsyncSession, two_media_on_groups: list[MediaGet], statements
+):
+    group_id = two_media_on_groups[0].group_id
+    statements.clear()
+
+    media_list = await MediaCRUD.get_media_by_group(group_id, db_session, query)
+
+    assert len(media_list) == 1
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_media_by_group_empty_and_missing_group(
+    db_session: AsyncSession, two_groups
+):
+    assert await MediaCRUD.get_media_by_group(two_groups[0].id, db_session) == []
+    for query in [None, MediaQuery(search_term="bike"), MediaQuery(fields=["id"])]:
+        with pytest.raises(ValueError):
+            await MediaCRUD.get_media_by_group(0, db_session, query)
+
+
+@pytest.mark.asyncio
+async def test_get_media_by_group_projection(
+    db_session: AsyncSession, two_media_on_groups: list[MediaGet]
+):
+    media = two_media_on_groups[0]
+
+    media_list = await MediaCRUD.get_media_by_group(
+        media.group_id, db_session, MediaQuery(fields=["id", "tags"])
+    )
+    page = await MediaCRUD.get_media_page(
+        media.group_id, db_session, limit=1, fields=["name"]
+    )
+
+    assert [item.model_dump(include={"id", "tags"}) for item in media_list] == [
+        {"id": media.id, "tags": media.tags}
+    ]
+    assert media_list[0].model_fields_set == {"id", "tags"}
+    assert page.items[0].model_fields_set == {"name"}
+    assert page.items[0].name == media.name
@@ -0,0 +1,168 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud.group import GroupCRUD
+from src.crud.media import MediaCRUD
+from src.crud.tag import TagCRUD
+from src.database.models import Tag, media_tags
+from src.database.schemas import GroupGet, MediaCreate, MediaGet, TagGet
+
+
+def test_normalize_tags():
+    assert TagCRUD.normalize_tags(["Bike", "bike", "FUNNY", " ", ""]) == [
+        "bike",
+        "funny",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_media_counts_tags(
+    db_session: AsyncSession, two_groups: list[GroupGet]
+):
+    group_id = two_groups[0].id
+    for tags in [["Bike", "FUNNY"], ["bike", "BIKE"], []]:
+        await MediaCRUD.create_media(
+            MediaCreate(group_id=group_id, is_image=True, tags=tags), db_session
+        )
+
+    assert await TagCRUD.get_group_tags(group_id, db_session) == [
+        TagGet(name="bike", usage_count=2),
+        TagGet(name="funny", usage_count=1),
+    ]
+    assert await TagCRUD.get_group_tags(two_groups[1].id, db_session) == []
+    assert await TagCRUD.get_tag(group_id, "BIKE", db_session) == TagGet(
+        name="bike", usage_count=2
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_group_tags_limit(
+    db_session: AsyncSession, two_media_on_groups: list[MediaGet]
+):
+    group_id = two_media_on_groups[0].group_id
+
+    tags = await TagCRUD.get_group_tags(group_id, db_session, limit=2)
+
+    assert [tag.name for tag in tags] == ["bike", "fall"]
+
+
+@pytest.mark.asyncio
+async def test_get_tag_not_found(db_session: AsyncSession, two_groups):
+    with pytest.raises(ValueError):
+        await TagCRUD.get_tag(two_groups[0].id, "bike", db_session)
+
+
+@pytest.mark.asyncio
+async def test_delete_media_updates_tags(
+    db_session: AsyncSession, two_groups: list[GroupGet]
+):
+    group_id = two_groups[0].id
+    kept = await MediaCRUD.create_media(
+        MediaCreate(group_id=group_id, is_image=True, tags=["bike"]), db_session
+    )
+    deleted = await MediaCRUD.create_media(
+        MediaCreate(group_id=group_id, is_image=True, tags=["bike", "fun"]),
+        db_session,
+    )
+
+    await MediaCRUD.delete_media_from_db(deleted.id, db_session)
+
+    assert await TagCRUD.get_group_tags(group_id, db_session) == [
+        TagGet(name="bike", usage_count=1)
+    ]
+    links = await db_session.execute(select(media_tags.c.media_id))
+    assert links.scalars().all() == [kept.id]
+
+
+@pytest.mark.asyncio
+async def test_delete_group_removes_tags(
+    db_session: AsyncSession, two_media_on_groups: list[MediaGet]
+):
+    await GroupCRUD.delete_group(two_media_on_groups[0].group_id, db_session)
+
+    tag_groups = await db_session.execute(select(Tag.group_id).distinct())
+    links = await db_session.execute(select(func.count()).select_from(media_tags))
+    assert tag_groups.scalars().all() == [two_media_on_groups[1].group_id]
+    assert links.scalar() == 2
+
+
+@pytest.mark.asyncio
+async def test_autocomplete(db_session: AsyncSession, two_groups: list[GroupGet]):
+    group_id = two_groups[0].id
+    for tags in [["Bike", "bikes"], ["bikes"], ["fall"]]:
+        await MediaCRUD.create_media(
+            MediaCreate(group_id=group_id, is_image=True, tags=tags), db_session
+        )
+
+    assert await TagCRUD.autocomplete(group_id, "BI", db_session) == [
+        TagGet(name="bikes", usage_count=2),
+        TagGet(name="bike", usage_count=1),
+    ]
+    assert await TagCRUD.autocomplete(two_groups[1].id, "bi", db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_follows_media_changes(
+    db_session: AsyncSession, two_media_on_groups: list[MediaGet]
+):
+    group_id = two_media_on_groups[0].group_id
+    assert await TagCRUD.autocomplete(group_id, "b", db_session) == [
+        TagGet(name="bike", usage_count=1)
+    ]
+
+    created = await MediaCRUD.create_media(
+        MediaCreate(group_id=group_id, is_image=True, tags=["bikes", "bike"]),
+        db_session,
+    )
+    # the index only follows committed writes
+    assert await TagCRUD.autocomplete(group_id, "b", db_session) == [
+        TagGet(name="bike", usage_count=1)
+    ]
+    await db_session.commit()
+    assert await TagCRUD.autocomplete(group_id, "b", db_session) == [
+        TagGet(name="bike", usage_count=2),
+        TagGet(name="bikes", usage_count=1),
+    ]
+
+    await MediaCRUD.delete_media_from_db(created.id, db_session)
+    await MediaCRUD.delete_media_from_db(two_media_on_groups[0].id, db_session)
+    await db_session.commit()
+    assert await TagCRUD.autocomplete(group_id, "b", db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_group_not_found(db_session: AsyncSession):
+    with pytest.raises(ValueError):
+        await TagCRUD.autocomplete(0, "b", db_session)
+
+
+@pytest.mark.asyncio
+async def test_tag_stats_follow_media_changes(
+    db_session: AsyncSession, two_media_on_groups: list[MediaGet]
+):
+    group_id = two_media_on_groups[0].group_id
+    stats = await TagCRUD.get_tag_stats(group_id, db_session)
+    assert stats.frequency == {"bike": 1, "funny": 1, "fall": 1}
+
+    await MediaCRUD.create_media(
+        MediaCreate(group_id=group_id, is_image=True, tags=["Bike", "cat"]),
+        db_session,
+    )
+    assert (await TagCRUD.get_tag_stats(group_id, db_session)).frequency["bike"] == 1
+    await db_session.commit()
+    stats = await TagCRUD.get_tag_stats(group_id, db_session)
+    assert stats.frequency["bike"] == 2
+    assert stats.cooccurrence["bike"] == {"funny": 1, "fall": 1, "cat": 1}
+
+    await MediaCRUD.delete_media_from_db(two_media_on_groups[0].id, db_session)
+    await db_session.commit()
+    stats = await TagCRUD.get_tag_stats(group_id, db_session)
+    assert stats.frequency == {"bike": 1, "cat": 1}
+    assert stats.related("bike") == [("cat", 1.0)]
+
+
+@pytest.mark.asyncio
+async def test_tag_stats_group_not_found(db_session: AsyncSession):
+    with pytest.raises(ValueError):
+        await TagCRUD.get_tag_stats(0, db_session)
@@ -4,7 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud.friend import FriendCRUD
 from src.crud.user import UserCRUD
-from src.database.models import FriendRequest, Friendship, User
+from src.database.models import FriendRequest, Friendship, Token, User
 from src.database.schemas import FriendRequestGet, PrivateUser, PublicUser, UpdateUser
 from src.tests.conftest import USER_1, USER_2
 
@@ -191,3 +191,46 @@ async def test_user_delete_request(
     friend_request = result.fetchone()
 
     assert friend_request is None
+
+
+@pytest.mark.asyncio
+async def test_create_token_replaces_previous_token(
+    db_session: AsyncSession, two_users: list[PrivateUser]
+):
+    user_1, _ = two_users
+    await UserCRUD.create_token("first-token", db_session, user_mail=user_1.mail)
+    await UserCRUD.deactivate_token(user_1, db_session)
+    await UserCRUD.create_token("second-token", db_session, user_mail=user_1.mail)
+
+    result = await db_session.execute(
+        select(Token).where(Token.user_mail == user_1.mail)
+    )
+    tokens = result.scalars().all()
+
+    assert len(tokens) == 1
+    assert tokens[0].access_token == "second-token"
+    assert tokens[0].is_active
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_token(
+    db_session: AsyncSession, two_users: list[PrivateUser]
+):
+    user_1, user_2 = two_users
+    await UserCRUD.create_token("user-1-token", db_session, user_mail=user_1.mail)
+
+    assert (
+        await UserCRUD.get_user_by_token(user_1.mail, "user-1-token", db_session)
+        == user_1
+    )
+    assert (
+        await UserCRUD.get_user_by_token(user_2.mail, "user-1-token", db_session)
+        is None
+    )
+    assert await UserCRUD.get_user_by_token(user_1.mail, "other", db_session) is None
+
+    await UserCRUD.deactivate_token(user_1, db_session)
+    assert (
+        await UserCRUD.get_user_by_token(user_1.mail, "user-1-token", db_session)
+        is None
+    )
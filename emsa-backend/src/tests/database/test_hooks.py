@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import text
+
+from src.database.hooks import after_commit
+from src.database.session import async_session_global
+
+
+@pytest.mark.asyncio
+async def test_after_commit_runs_on_commit():
+    calls = []
+    async with async_session_global() as db:
+        await db.execute(text("SELECT 1"))
+        after_commit(db, lambda: calls.append("first"))
+        after_commit(db, lambda: calls.append("second"))
+        assert calls == []
+
+        await db.commit()
+
+        assert calls == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_after_commit_is_dropped_on_rollback():
+    calls = []
+    async with async_session_global() as db:
+        await db.execute(text("SELECT 1"))
+        after_commit(db, lambda: calls.append("rolled back"))
+        await db.rollback()
+
+        await db.execute(text("SELECT 1"))
+        await db.commit()
+
+        assert calls == []
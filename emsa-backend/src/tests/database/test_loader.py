@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud.group import GroupCRUD
+from src.crud.user import UserCRUD
+from src.database.loader import BatchLoader, attach_loaders, get_loader
+from src.database.schemas import GroupGet, GroupUpdate, PrivateUser
+from src.tests.conftest import USER_1, USER_2
+
+
+class RecordingBatchFn:
+    def __init__(self, values: dict) -> None:
+        self.values = values
+        self.calls: list[list] = []
+
+    async def __call__(self, keys: list) -> dict:
+        self.calls.append(keys)
+        return {key: self.values[key] for key in keys if key in self.values}
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_batches_concurrent_loads():
+    batch_fn = RecordingBatchFn({1: "one", 2: "two"})
+    loader = BatchLoader(batch_fn)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(3))
+
+    assert results == ["one", "two", None]
+    assert batch_fn.calls == [[1, 2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_memoizes_values():
+    batch_fn = RecordingBatchFn({1: "one"})
+    loader = BatchLoader(batch_fn)
+
+    assert await loader.load(1) == "one"
+    assert await loader.load(1) == "one"
+    assert await loader.load_many([1]) == {1: "one"}
+    assert batch_fn.calls == [[1]]
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_prime_and_forget():
+    batch_fn = RecordingBatchFn({1: "one"})
+    loader = BatchLoader(batch_fn)
+    loader.prime(1, "primed")
+
+    assert await loader.load(1) == "primed"
+    loader.forget(1)
+    assert await loader.load(1) == "one"
+    assert batch_fn.calls == [[1]]
+
+
+@pytest.mark.asyncio
+async def test_get_loader_requires_attached_loaders(db_session: AsyncSession):
+    async def batch_fn(keys, db):
+        return {}
+
+    assert get_loader(db_session, "users", batch_fn) is None
+    attach_loaders(db_session)
+    loader = get_loader(db_session, "users", batch_fn)
+    assert loader is not None
+    assert get_loader(db_session, "users", batch_fn) is loader
+
+
+@pytest.mark.asyncio
+async def test_user_crud_uses_identity_map(
+    db_session: AsyncSession, two_users: list[PrivateUser]
+):
+    attach_loaders(db_session)
+    users = await UserCRUD.get_users_by_mail([USER_1.mail, USER_2.mail], db_session)
+    assert set(users) == {USER_1.mail, USER_2.mail}
+
+    user = await UserCRUD.get_user(USER_1.mail, db_session)
+    assert user is users[USER_1.mail]
+
+    await UserCRUD.delete_user(USER_2.mail, db_session)
+    with pytest.raises(ValueError):
+        await UserCRUD.get_user(USER_2.mail, db_session)
+
+
+@pytest.mark.asyncio
+async def test_group_crud_uses_identity_map(
+    db_session: AsyncSession, two_groups: list[GroupGet]
+):
+    attach_loaders(db_session)
+    group = await GroupCRUD.get_group(two_groups[0].id, db_session)
+    assert group is await GroupCRUD.get_group(two_groups[0].id, db_session)
+
+    await GroupCRUD.update_group(
+        group.id, GroupUpdate(name="Renamed", owner_mail=group.owner_mail), db_session
+    )
+    assert (await GroupCRUD.get_group(group.id, db_session)).name == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_keeps_dispatch_task():
+    batch_fn = RecordingBatchFn({1: "one"})
+    loader = BatchLoader(batch_fn)
+
+    load = asyncio.ensure_future(loader.load(1))
+    await asyncio.sleep(0)
+    assert len(loader._dispatch_tasks) == 1
+
+    assert await load == "one"
+    await asyncio.sleep(0)
+    assert loader._dispatch_tasks == set()
+
+
+@pytest.mark.asyncio
+async def test_remove_user_from_group_primes_loaders(
+    db_session: AsyncSession, two_groups: list[GroupGet]
+):
+    attach_loaders(db_session)
+    group = two_groups[0]
+    await GroupCRUD.remove_user_from_group(group.id, group.owner_mail, db_session)
+
+    group_loader = GroupCRUD._group_loader(db_session)
+    user_loader = UserCRUD._user_loader(db_session)
+    assert group.id in group_loader._values
+    assert group.owner_mail in user_loader._values
+
+    with pytest.raises(ValueError, match="No group found"):
+        await GroupCRUD.remove_user_from_group(-1, group.owner_mail, db_session)
+    with pytest.raises(ValueError, match="No user found"):
+        await GroupCRUD.remove_user_from_group(group.id, "nobody@x.com", db_session)
+    with pytest.raises(ValueError, match="No group found"):
+        await GroupCRUD.remove_user_from_group(-1, "nobody@x.com", db_session)
@@ -0,0 +1,157 @@
+import asyncio
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+from uuid import uuid4
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.database import models  # noqa: F401
+from src.database.session import Base
+from src.database.trigram import create_trigram_search, is_trigram_search_installed
+from src.settings import settings
+
+BACKEND_ROOT = Path(__file__).resolve().parents[3]
+
+
+async def _execute_autocommit(url: str, statement: str) -> None:
+    engine = create_async_engine(url, isolation_level="AUTOCOMMIT")
+    async with engine.connect() as conn:
+        await conn.execute(text(statement))
+    await engine.dispose()
+
+
+async def _schema_diff(url: str) -> list:
+    engine = create_async_engine(url)
+    async with engine.connect() as conn:
+        diff = await conn.run_sync(
+            lambda sync_conn: compare_metadata(
+                MigrationContext.configure(sync_conn, opts={"compare_type": True}),
+                Base.metadata,
+            )
+        )
+    await engine.dispose()
+    return diff
+
+
+async def _fetch(url: str, statements: list[str], query: str) -> list:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        for statement in statements:
+            await conn.execute(text(statement))
+        rows = (await conn.execute(text(query))).all()
+    await engine.dispose()
+    return rows
+
+
+@contextmanager
+def scratch_database() -> Iterator[tuple[Config, str]]:
+    database = f"emsa_migrations_{uuid4().hex[:8]}"
+    scratch_url = (
+        make_url(settings.DATABASE_URL)
+        .set(database=database)
+        .render_as_string(hide_password=False)
+    )
+    asyncio.run(
+        _execute_autocommit(settings.DATABASE_URL, f"CREATE DATABASE {database}")
+    )
+    try:
+        config = Config(str(BACKEND_ROOT / "alembic.ini"))
+        config.set_main_option(
+            "script_location", str(BACKEND_ROOT / "src/database/migrations")
+        )
+        config.set_main_option("sqlalchemy.url", scratch_url.replace("%", "%%"))
+        yield config, scratch_url
+    finally:
+        asyncio.run(
+            _execute_autocommit(settings.DATABASE_URL, f"DROP DATABASE {database}")
+        )
+
+
+def test_migrations_match_models():
+    with scratch_database() as (config, scratch_url):
+        command.upgrade(config, "head")
+        assert asyncio.run(_schema_diff(scratch_url)) == []
+
+        command.downgrade(config, "base")
+        command.upgrade(config, "head")
+
+
+def test_baseline_database_upgrades():
+    # a database created with `create_all` before the migrations is stamped 0001
+    with scratch_database() as (config, scratch_url):
+        command.upgrade(config, "0001")
+        seed = [
+            "INSERT INTO users (mail, password_hash, name) VALUES ('a@b.c', 'h', 'a')",
+            "INSERT INTO tokens (access_token, is_active, user_mail) VALUES "
+            "('old', true, 'a@b.c'), ('new', true, 'a@b.c')",
+        ]
+        asyncio.run(_fetch(scratch_url, seed, "SELECT 1"))
+        command.upgrade(config, "head")
+
+        tokens = asyncio.run(_fetch(scratch_url, [], "SELECT access_token FROM tokens"))
+        assert asyncio.run(_schema_diff(scratch_url)) == []
+
+    assert [tuple(token) for token in tokens] == [("new",)]
+
+
+def test_tag_dictionary_backfill():
+    with scratch_database() as (config, scratch_url):
+        command.upgrade(config, "0004")
+        seed = [
+            "INSERT INTO users (mail, password_hash, name) VALUES ('a@b.c', 'h', 'a')",
+            "INSERT INTO groups (id, name, owner_mail) VALUES (1, 'g', 'a@b.c')",
+            "INSERT INTO media (group_id, name, is_image, tags) VALUES "
+            "(1, '', true, ARRAY['Bike', 'bike', 'fun', ' ']), "
+            "(1, '', true, ARRAY['BIKE']), (1, '', true, ARRAY[]::text[])",
+        ]
+        asyncio.run(_fetch(scratch_url, seed, "SELECT 1"))
+        command.upgrade(config, "head")
+
+        tags = asyncio.run(
+            _fetch(
+                scratch_url,
+                [],
+                "SELECT name, usage_count, "
+                "(SELECT count(*) FROM media_tags WHERE tag_id = tags.id) "
+                "FROM tags ORDER BY name",
+            )
+        )
+
+    assert [tuple(tag) for tag in tags] == [("bike", 2, 2), ("fun", 1, 1)]
+
+
+async def _trigram_search_installed(url: str) -> bool:
+    engine = create_async_engine(url)
+    async with engine.connect() as conn:
+        installed = await is_trigram_search_installed(conn)
+    await engine.dispose()
+    return installed
+
+
+def test_trigram_search_can_be_created_again():
+    available = asyncio.run(
+        _fetch(
+            settings.DATABASE_URL,
+            [],
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'",
+        )
+    )
+    if not available:
+        pytest.skip("pg_trgm extension is not available")
+    with scratch_database() as (config, scratch_url):
+        command.upgrade(config, "head")
+        asyncio.run(_execute_autocommit(scratch_url, "DROP EXTENSION pg_trgm CASCADE"))
+        assert not asyncio.run(_trigram_search_installed(scratch_url))
+
+        asyncio.run(create_trigram_search(scratch_url))
+        asyncio.run(create_trigram_search(scratch_url))
+
+        assert asyncio.run(_trigram_search_installed(scratch_url))
@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.database.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(created_at, 42)
+
+    assert decode_cursor(cursor) == (created_at, 42)
+    assert "=" not in cursor
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["", "not-a-cursor", "W10", encode_cursor(datetime(2024, 1, 1), 1)],
+)
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
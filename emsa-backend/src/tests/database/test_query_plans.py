@@ -0,0 +1,239 @@
+"""
+Query plan regression tests.
+
+The tables are seeded with enough rows for the planner to prefer indexes, then
+every statement issued by the CRUD layer is captured and run through EXPLAIN.
+A sequential scan over one of the large tables fails the test. Full listings
+(`get_users`, `get_groups`, `get_all_media`, `get_revoked_tokens`) read whole
+tables by design and are not exercised here.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.crud.friend import FriendCRUD
+from src.crud.group import GroupCRUD
+from src.crud.login_attempt import LoginAttemptCRUD
+from src.crud.media import MediaCRUD
+from src.crud.tag import TagCRUD
+from src.crud.user import UserCRUD
+from src.database.schemas import (
+    GroupUpdate,
+    MediaCreate,
+    MediaQuery,
+    MediaUpdate,
+    PublicUser,
+    UpdateUser,
+)
+
+USERS = 20_000
+
+LARGE_TABLES = {
+    "users",
+    "tokens",
+    "refresh_tokens",
+    "revoked_tokens",
+    "login_attempts",
+    "friendships",
+    "friend_requests",
+    "groups",
+    "user_group_association",
+    "media",
+    "tags",
+    "media_tags",
+}
+
+EXPLAINED = ("SELECT", "UPDATE", "DELETE")
+
+SEED = [
+    f"""
+    INSERT INTO users (mail, password_hash, name)
+    SELECT 'user' || i || '@example.com', 'hash', 'user' || i
+    FROM generate_series(1, {USERS}) AS i
+    """,
+    f"""
+    INSERT INTO tokens (access_token, is_active, user_mail)
+    SELECT 'token-' || i, true, 'user' || i || '@example.com'
+    FROM generate_series(1, {USERS}) AS i
+    """,
+    f"""
+    INSERT INTO refresh_tokens (token_hash, user_mail, expires_at)
+    SELECT 'hash-' || i, 'user' || i || '@example.com', now() + interval '30 days'
+    FROM generate_series(1, {USERS}) AS i
+    """,
+    """
+    INSERT INTO revoked_tokens (jti, expires_at)
+    SELECT 'jti-' || i, now() + interval '1 hour'
+    FROM generate_series(1, 10000) AS i
+    """,
+    """
+    INSERT INTO login_attempts (key, attempted_at)
+    SELECT 'source:' || i % 5000, now() - (i % 600) * interval '1 second'
+    FROM generate_series(1, 100000) AS i
+    """,
+    f"""
+    INSERT INTO friendships (user_mail, friend_mail)
+    SELECT 'user' || i || '@example.com', 'user' || (i + k) % {USERS} + 1 || '@example.com'
+    FROM generate_series(1, {USERS}) AS i, generate_series(1, 5) AS k
+    """,
+    """
+    INSERT INTO friend_requests (sender_mail, receiver_mail)
+    SELECT 'user' || i || '@example.com', 'user' || i + 7 || '@example.com'
+    FROM generate_series(1, 10000) AS i
+    """,
+    """
+    INSERT INTO groups (name, owner_mail)
+    SELECT 'group' || i, 'user' || i % 5000 + 1 || '@example.com'
+    FROM generate_series(1, 5000) AS i
+    """,
+    """
+    INSERT INTO user_group_association (group_id, user_mail)
+    SELECT g.id, 'user' || (g.id * 3 + k) % 10000 + 1 || '@example.com'
+    FROM groups AS g, generate_series(0, 9) AS k
+    """,
+    """
+    INSERT INTO media (
+        group_id, name, is_image, image_path, link, preview_link, uploaded_by, tags
+    )
+    SELECT g.id, 'media' || k, true, '', '', '', '', ARRAY['tag' || k, 'common']
+    FROM groups AS g, generate_series(1, 20) AS k
+    """,
+    """
+    INSERT INTO tags (group_id, name, usage_count)
+    SELECT g.id, 'tag' || k, 1 FROM groups AS g, generate_series(1, 20) AS k
+    UNION ALL
+    SELECT g.id, 'common', 20 FROM groups AS g
+    """,
+    """
+    INSERT INTO media_tags (media_id, tag_id)
+    SELECT media.id, tags.id FROM media, unnest(media.tags) AS tag
+    JOIN tags ON tags.name = tag WHERE tags.group_id = media.group_id
+    """,
+]
+
+
+def mail(i: int) -> str:
+    return f"user{i}@example.com"
+
+
+def seq_scans(plan: dict) -> list[str]:
+    tables = []
+    if plan.get("Node Type") == "Seq Scan" and plan["Relation Name"] in LARGE_TABLES:
+        tables.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        tables.extend(seq_scans(child))
+    return tables
+
+
+async def seed(db: AsyncSession) -> tuple[int, int, int]:
+    for statement in SEED:
+        await db.execute(text(statement))
+    for table in LARGE_TABLES:
+        await db.execute(text(f"ANALYZE {table}"))
+    group_id, other_group_id = (
+        await db.execute(text("SELECT id FROM groups ORDER BY id LIMIT 2"))
+    ).scalars()
+    media_id = (
+        await db.execute(
+            text("SELECT min(id) FROM media WHERE group_id = :id"), {"id": group_id}
+        )
+    ).scalar()
+    return group_id, other_group_id, media_id
+
+
+async def exercise_crud(db: AsyncSession, group_id, other_group_id, media_id):
+    future = datetime.now(timezone.utc) + timedelta(days=1)
+    past = datetime.now(timezone.utc) - timedelta(minutes=5)
+
+    await UserCRUD.get_user(mail(1), db)
+    await UserCRUD.get_users_by_mail([mail(1), mail(2)], db)
+    await UserCRUD.get_user_by_token(mail(1), "token-1", db)
+    await UserCRUD.get_token(mail(1), db)
+    await UserCRUD.update_user(
+        mail(1), UpdateUser(name="renamed", password_hash="hash"), db
+    )
+    await UserCRUD.create_token("token-new", db, user_mail=mail(1))
+    await UserCRUD.deactivate_token(PublicUser(mail=mail(1), name="renamed"), db)
+    await UserCRUD.revoke_token("jti-new", future.timestamp(), db)
+    await UserCRUD.create_refresh_token(mail(1), "hash-new", future, db)
+    await UserCRUD.rotate_refresh_token("hash-2", "hash-rotated", future, db)
+    await UserCRUD.delete_refresh_tokens(mail(3), db)
+    await UserCRUD.delete_user(mail(15000), db)
+
+    await LoginAttemptCRUD.count_attempts("source:1", past, db)
+    await LoginAttemptCRUD.delete_attempts("source:1", past, db)
+
+    await FriendCRUD.check_if_friends(mail(1), mail(3), db)
+    await FriendCRUD.get_user_friends(mail(1), db)
+    await FriendCRUD.get_pending_requests(mail(8), db)
+    await FriendCRUD.get_sent_requests(mail(1), db)
+    await FriendCRUD.create_friend_request(mail(1), mail(100), db)
+    await FriendCRUD.handle_delete_request(mail(2), mail(9), db)
+    await FriendCRUD.add_friend(mail(1), mail(200), db)
+    await FriendCRUD.remove_friend(mail(1), mail(200), db)
+
+    await GroupCRUD.get_group(group_id, db)
+    await GroupCRUD.update_group(
+        group_id, GroupUpdate(name="renamed", owner_mail=mail(1)), db
+    )
+    await GroupCRUD.add_users_to_group(group_id, [mail(300)], db)
+    await GroupCRUD.get_users_in_group(group_id, db)
+    await GroupCRUD.get_user_groups(mail(4), db)
+    await GroupCRUD.get_user_owned_groups(mail(2), db)
+    await GroupCRUD.remove_user_from_group(group_id, mail(300), db)
+
+    await MediaCRUD.get_media(media_id, db)
+    await MediaCRUD.create_media(
+        MediaCreate(group_id=group_id, is_image=True, tags=["tag1", "new"]), db
+    )
+    await MediaCRUD.update_media(media_id, MediaUpdate(name="renamed"), db)
+    await MediaCRUD.get_media_by_group(group_id, db, MediaQuery(search_term="tag1"))
+    await MediaCRUD.get_media_by_group(group_id, db, MediaQuery(fields=["id"]))
+    page = await MediaCRUD.get_media_page(group_id, db, limit=5)
+    await MediaCRUD.get_media_page(group_id, db, limit=5, cursor=page.next_cursor)
+    await MediaCRUD.delete_media_from_db(media_id, db)
+    await TagCRUD.get_group_tags(group_id, db, limit=10)
+    await TagCRUD.get_tag(group_id, "common", db)
+    await TagCRUD.autocomplete(group_id, "ta", db)
+    await TagCRUD.get_tag_stats(group_id, db)
+    await GroupCRUD.delete_group(other_group_id, db)
+
+
+@pytest.mark.asyncio
+async def test_crud_queries_do_not_scan_large_tables(
+    db_session: AsyncSession, async_db_connection: AsyncConnection
+):
+    ids = await seed(db_session)
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(EXPLAINED):
+            statements.append((statement, parameters))
+
+    sync_engine = async_db_connection.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        await exercise_crud(db_session, *ids)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+
+    assert statements
+    connection = await db_session.connection()
+    offenders = []
+    for statement, parameters in statements:
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        tables = seq_scans(plan[0]["Plan"])
+        if tables:
+            offenders.append(f"{', '.join(tables)}: {statement}")
+
+    assert not offenders, "Sequential scans on large tables:\n" + "\n".join(offenders)
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.database.session import engine, get_db, get_read_db
+from src.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_uses_read_only_engine():
+    async for db in get_read_db():
+        assert (await db.execute(text("SELECT 1"))).scalar() == 1
+        connection = await db.connection()
+        options = connection.sync_connection.get_execution_options()
+        if settings.DB_READ_AUTOCOMMIT:
+            assert options["isolation_level"] == "AUTOCOMMIT"
+        else:
+            assert options["postgresql_readonly"]
+
+
+@pytest.mark.asyncio
+async def test_read_only_transactions_reject_writes():
+    engine = create_async_engine(settings.DATABASE_URL)
+    try:
+        async with AsyncSession(
+            engine.execution_options(postgresql_readonly=True)
+        ) as db:
+            with pytest.raises(exc.DBAPIError, match="read-only transaction"):
+                await db.execute(
+                    text("CREATE TEMPORARY TABLE read_only_check (id int)")
+                )
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_db_without_statements_skips_the_pool():
+    checkouts = engine.sync_engine.pool.stats.checkouts
+
+    async for db in get_db():
+        assert not db.in_transaction()
+
+    assert engine.sync_engine.pool.stats.checkouts == checkouts
+
+
+@pytest.mark.asyncio
+async def test_get_db_checks_out_on_first_statement():
+    checkouts = engine.sync_engine.pool.stats.checkouts
+
+    async for db in get_db():
+        assert engine.sync_engine.pool.stats.checkouts == checkouts
+        await db.execute(text("SELECT 1"))
+        assert db.in_transaction()
+
+    assert engine.sync_engine.pool.stats.checkouts == checkouts + 1
@@ -0,0 +1,15 @@
+import pytest
+
+from src.database.session import engine
+from src.database.trigram import check_trigram_search, is_trigram_search_installed
+
+
+@pytest.mark.asyncio
+async def test_check_trigram_search_fails_without_the_function():
+    # the test schema comes from create_all, which does not create it
+    async with engine.connect() as conn:
+        if await is_trigram_search_installed(conn):
+            pytest.skip("trigram search is installed in the test database")
+
+    with pytest.raises(RuntimeError, match="python -m src.database.trigram"):
+        await check_trigram_search(engine)
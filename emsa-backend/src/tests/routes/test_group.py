@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud.group import GroupCRUD
 from src.routes.contracts import AddGroupMembersRequest
+from src.settings import settings
 from src.tests.conftest import (
     GROUP_1,
     MEDIA_DATA_1,
@@ -152,28 +153,29 @@ async def test_get_group_members(
 @pytest.mark.asyncio
 async def test_get_group_content(client: AsyncClient, advanced_use_case, db_session):
     group_id = advanced_use_case["group_ids"][0]
+    # newest first
     expected_group_content = [
         {
             "group_id": group_id,
-            "is_image": MEDIA_DATA_1["is_image"],
-            "name": MEDIA_DATA_1["name"],
-            "image_path": MEDIA_DATA_1["image_path"],
-            "link": "",
+            "is_image": MEDIA_DATA_2["is_image"],
+            "name": MEDIA_DATA_2["name"],
+            "image_path": "",
+            "link": MEDIA_DATA_2["link"],
             "preview_link": "",
             "uploaded_by": "",
             "id": ANY,
-            "tags": ["Bike", "FUNNY", "fall"],
+            "tags": ["FUNNY", "fall"],
         },
         {
             "group_id": group_id,
-            "is_image": MEDIA_DATA_2["is_image"],
-            "name": MEDIA_DATA_2["name"],
-            "image_path": "",
-            "link": MEDIA_DATA_2["link"],
+            "is_image": MEDIA_DATA_1["is_image"],
+            "name": MEDIA_DATA_1["name"],
+            "image_path": MEDIA_DATA_1["image_path"],
+            "link": "",
             "preview_link": "",
             "uploaded_by": "",
             "id": ANY,
-            "tags": ["FUNNY", "fall"],
+            "tags": ["Bike", "FUNNY", "fall"],
         },
     ]
 
@@ -238,6 +240,219 @@ async def test_group_content_nonexistent_search_term(
     assert len(response.json()) == 0
 
 
+@pytest.mark.asyncio
+async def test_group_content_search_is_ranked_and_paged(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    group_id = advanced_use_case["group_ids"][0]
+    headers = await headers_for_user1(db_session)
+
+    response = await client.get(
+        f"/group_content/{group_id}?search_term=funny&with_score=true",
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    ranked = response.json()
+    # both have a FUNNY tag, only the first one has it in its name too
+    assert [media["name"] for media in ranked] == [
+        MEDIA_DATA_1["name"],
+        MEDIA_DATA_2["name"],
+    ]
+    assert ranked[0]["score"] > ranked[1]["score"]
+
+    first_page = await client.get(
+        f"/group_content/{group_id}?search_term=funny&limit=1", headers=headers
+    )
+    second_page = await client.get(
+        f"/group_content/{group_id}?search_term=funny&limit=1&offset=1",
+        headers=headers,
+    )
+    assert [media["id"] for media in first_page.json()] == [ranked[0]["id"]]
+    assert [media["id"] for media in second_page.json()] == [ranked[1]["id"]]
+    assert "score" not in first_page.json()[0]
+
+
+@pytest.mark.asyncio
+async def test_group_content_rejects_invalid_limit(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    group_id = advanced_use_case["group_ids"][0]
+
+    response = await client.get(
+        f"/group_content/{group_id}?search_term=funny&limit=0",
+        headers=await headers_for_user1(db_session),
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_group_content_pages(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    group_id = advanced_use_case["group_ids"][0]
+    headers = await headers_for_user1(db_session)
+
+    first_page = await client.get(f"/group_content/{group_id}?limit=1", headers=headers)
+    assert first_page.status_code == status.HTTP_200_OK, first_page.json()
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = await client.get(
+        f"/group_content/{group_id}", params={"cursor": cursor}, headers=headers
+    )
+    assert second_page.status_code == status.HTTP_200_OK, second_page.json()
+    assert "X-Next-Cursor" not in second_page.headers
+
+    # the pages follow the order of the unpaged listing
+    listing = await client.get(f"/group_content/{group_id}", headers=headers)
+    assert [media["id"] for media in first_page.json() + second_page.json()] == [
+        media["id"] for media in listing.json()
+    ]
+
+
+@pytest.mark.asyncio
+async def test_group_content_invalid_cursor(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    group_id = advanced_use_case["group_ids"][0]
+
+    response = await client.get(
+        f"/group_content/{group_id}?cursor=invalid",
+        headers=await headers_for_user1(db_session),
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_group_content_page_size_cap(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    group_id = advanced_use_case["group_ids"][0]
+
+    response = await client.get(
+        f"/group_content/{group_id}?limit={settings.MEDIA_PAGE_MAX_SIZE + 1}",
+        headers=await headers_for_user1(db_session),
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_group_content_fields(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    group_id = advanced_use_case["group_ids"][0]
+    headers = await headers_for_user1(db_session)
+
+    listing = await client.get(
+        f"/group_content/{group_id}?fields=id&fields=tags", headers=headers
+    )
+    page = await client.get(
+        f"/group_content/{group_id}?fields=name&limit=1", headers=headers
+    )
+    search = await client.get(
+        f"/group_content/{group_id}?fields=id&search_term=bike&with_score=true",
+        headers=headers,
+    )
+
+    assert listing.status_code == status.HTTP_200_OK, listing.json()
+    assert [set(media) for media in listing.json()] == [{"id", "tags"}] * 2
+    assert page.json() == [{"name": MEDIA_DATA_2["name"]}]
+    assert "X-Next-Cursor" in page.headers
+    assert [set(media) for media in search.json()] == [{"id", "score"}]
+
+
+@pytest.mark.asyncio
+async def test_group_content_invalid_fields(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    group_id = advanced_use_case["group_ids"][0]
+
+    response = await client.get(
+        f"/group_content/{group_id}?fields=password",
+        headers=await headers_for_user1(db_session),
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_group_tags(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    group_id = advanced_use_case["group_ids"][0]
+
+    response = await client.get(
+        f"/group_tags/{group_id}",
+        headers=await headers_for_user1(db_session),
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    assert response.json() == [
+        {"name": "fall", "usage_count": 2},
+        {"name": "funny", "usage_count": 2},
+        {"name": "bike", "usage_count": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_group_tags_group_not_found(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    response = await client.get(
+        "/group_tags/0",
+        headers=await headers_for_user1(db_session),
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_group_tags_autocomplete(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    group_id = advanced_use_case["group_ids"][0]
+
+    response = await client.get(
+        f"/group_tags/{group_id}/autocomplete?prefix=F&limit=1",
+        headers=await headers_for_user1(db_session),
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    assert response.json() == [{"name": "fall", "usage_count": 2}]
+
+
+@pytest.mark.asyncio
+async def test_group_tags_autocomplete_group_not_found(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    response = await client.get(
+        "/group_tags/0/autocomplete?prefix=f",
+        headers=await headers_for_user1(db_session),
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 @pytest.mark.asyncio
 async def test_remove_group(
     client: AsyncClient,
@@ -0,0 +1,55 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.database.pool import InstrumentedQueuePool, pool_status
+from src.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_health(client: AsyncClient):
+    response = await client.get("/health")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"status": "healthy"}
+
+
+@pytest.mark.asyncio
+async def test_pool_health(client: AsyncClient):
+    response = await client.get("/health/pool")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {"size", "checked_out", "idle", "overflow", "checkouts"} <= set(
+        response.json()["primary"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_health(client: AsyncClient):
+    response = await client.get("/health/search")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["engine"] == settings.MEDIA_SEARCH_ENGINE
+    assert {"size", "hits", "misses", "hit_ratio"} <= set(response.json()["cache"])
+
+
+@pytest.mark.asyncio
+async def test_pool_status_tracks_checkouts():
+    engine = create_async_engine(
+        settings.DATABASE_URL, poolclass=InstrumentedQueuePool, pool_size=2
+    )
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            status_in_use = pool_status(engine)
+        status_after = pool_status(engine)
+    finally:
+        await engine.dispose()
+
+    assert status_in_use["checked_out"] == 1
+    assert status_after["checked_out"] == 0
+    assert status_after["idle"] == 1
+    assert status_after["checkouts"] == 1
+    assert status_after["max_wait_sec"] >= 0
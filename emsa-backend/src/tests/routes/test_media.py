@@ -7,6 +7,7 @@ from fastapi import status
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.settings import settings
 from src.tests.conftest import GROUP_1, USER_1, headers_for_user1
 
 logging.basicConfig(level=logging.ERROR)
@@ -30,6 +31,107 @@ async def test_proposed_tags(
     assert response.json() == expected_response
 
 
+@pytest.mark.asyncio
+async def test_proposed_tags_with_group(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    payload = {
+        "name": "Bike",
+        "is_image": True,
+        "group_id": advanced_use_case["group_ids"][0],
+    }
+
+    response = await client.post(
+        "/propose_tags",
+        json=payload,
+        headers=await headers_for_user1(db_session),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    # the only media tagged bike is also tagged funny and fall
+    assert response.json() == {"proposed_tags": ["bike", "fall", "funny"]}
+
+
+@pytest.mark.asyncio
+async def test_proposed_tags_group_not_found(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    payload = {"name": "Bike", "is_image": True, "group_id": 0}
+
+    response = await client.post(
+        "/propose_tags",
+        json=payload,
+        headers=await headers_for_user1(db_session),
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_proposed_tags_batch(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    group_id = advanced_use_case["group_ids"][0]
+    payload = {
+        "items": [
+            {"name": "Test Media", "is_image": False, "link": "https://example.com"},
+            {"name": "Bike", "is_image": True, "group_id": group_id},
+            {"name": "Bike", "is_image": True, "group_id": group_id},
+        ]
+    }
+
+    response = await client.post(
+        "/propose_tags/batch",
+        json=payload,
+        headers=await headers_for_user1(db_session),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "proposals": [
+            {"proposed_tags": ["test", "media", "example"]},
+            {"proposed_tags": ["bike", "fall", "funny"]},
+            {"proposed_tags": ["bike", "fall", "funny"]},
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_proposed_tags_batch_group_not_found(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    payload = {"items": [{"name": "Bike", "is_image": True, "group_id": 0}]}
+
+    response = await client.post(
+        "/propose_tags/batch",
+        json=payload,
+        headers=await headers_for_user1(db_session),
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_proposed_tags_batch_too_large(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    advanced_use_case,
+):
+    item = {"name": "Bike", "is_image": True}
+    payload = {"items": [item] * (settings.TAG_PROPOSER_MAX_BATCH_SIZE + 1)}
+
+    response = await client.post(
+        "/propose_tags/batch",
+        json=payload,
+        headers=await headers_for_user1(db_session),
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 @pytest.mark.asyncio
 async def test_add_link(
     client: AsyncClient,
@@ -6,6 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.crud.friend import FriendCRUD
 from src.crud.user import UserCRUD
 from src.routes.contracts import AddFriendRequest
+from src.services.rate_limiter import login_rate_limiter
+from src.settings import settings
 from src.tests.conftest import (
     USER_1,
     USER_2,
@@ -70,6 +72,79 @@ async def test_register_conflict(
     assert response.status_code == status.HTTP_409_CONFLICT
 
 
+@pytest.mark.asyncio
+async def test_refresh_token(
+    client: AsyncClient, db_session: AsyncSession, advanced_use_case
+):
+    user_data = {"mail": "newuser@example.com", "password": "newpassword"}
+    await client.post("/register", json=user_data)
+    login_response = await client.post("/login", json=user_data)
+    refresh_token = login_response.json()["refresh_token"]
+
+    response = await client.post(
+        "/token/refresh", json={"refresh_token": refresh_token}
+    )
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response_data["refresh_token"] != refresh_token
+    user_details = await client.get(
+        "/user_details",
+        headers={"Authorization": f"Bearer {response_data['access_token']}"},
+    )
+    assert user_details.json()["mail"] == user_data["mail"]
+
+    reused_response = await client.post(
+        "/token/refresh", json={"refresh_token": refresh_token}
+    )
+    assert reused_response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_after_logout(
+    client: AsyncClient, db_session: AsyncSession, advanced_use_case
+):
+    user_data = {"mail": "newuser@example.com", "password": "newpassword"}
+    await client.post("/register", json=user_data)
+    login_response = await client.post("/login", json=user_data)
+    login_data = login_response.json()
+
+    await client.post(
+        "/logout",
+        headers={"Authorization": f"Bearer {login_data['access_token']}"},
+    )
+    response = await client.post(
+        "/token/refresh", json={"refresh_token": login_data["refresh_token"]}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_logout_stateless_revokes_presented_token(
+    client: AsyncClient, db_session: AsyncSession, advanced_use_case, monkeypatch
+):
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    user_data = {"mail": "newuser@example.com", "password": "newpassword"}
+    await client.post("/register", json=user_data)
+    first = (await client.post("/login", json=user_data)).json()["access_token"]
+    second = (await client.post("/login", json=user_data)).json()["access_token"]
+
+    response = await client.post(
+        "/logout", headers={"Authorization": f"Bearer {first}"}
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = await client.get(
+        "/user_details", headers={"Authorization": f"Bearer {first}"}
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = await client.get(
+        "/user_details", headers={"Authorization": f"Bearer {second}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
 @pytest.mark.asyncio
 async def test_login_bad_request(
     client: AsyncClient,
@@ -86,6 +161,23 @@ async def test_login_bad_request(
     assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+@pytest.mark.asyncio
+async def test_login_too_many_attempts(
+    client: AsyncClient, db_session: AsyncSession, advanced_use_case, monkeypatch
+):
+    monkeypatch.setattr(login_rate_limiter, "max_per_account", 2)
+    user_data = {"mail": USER_1.mail, "password": "invalidpassword"}
+
+    responses = [await client.post("/login", json=user_data) for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [
+        status.HTTP_400_BAD_REQUEST,
+        status.HTTP_400_BAD_REQUEST,
+        status.HTTP_429_TOO_MANY_REQUESTS,
+    ]
+    assert "Retry-After" in responses[-1].headers
+
+
 @pytest.mark.asyncio
 async def test_user_details(
     client: AsyncClient, db_session: AsyncSession, advanced_use_case
@@ -139,6 +231,27 @@ async def test_update_account(client: AsyncClient, advanced_use_case, db_session
     assert response_data["name"] == updated_user.name
 
 
+@pytest.mark.asyncio
+async def test_update_account_password_revokes_refresh_tokens(
+    client: AsyncClient, db_session: AsyncSession, advanced_use_case
+):
+    user_data = {"mail": "newuser@example.com", "password": "newpassword"}
+    await client.post("/register", json=user_data)
+    login_data = (await client.post("/login", json=user_data)).json()
+
+    response = await client.put(
+        "/update_account",
+        json={"name": "New User", "password_hash": "UpdatedPassword"},
+        headers={"Authorization": f"Bearer {login_data['access_token']}"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = await client.post(
+        "/token/refresh", json={"refresh_token": login_data["refresh_token"]}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
 @pytest.mark.asyncio
 async def test_create_friend_request(
     client: AsyncClient, db_session: AsyncSession, advanced_use_case
@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+import pytest
+
+from src.exceptions import PasswordHasherBusy
+from src.services.password_hasher import PasswordHasher
+
+FAST_METHOD = "scrypt:1024:8:1"
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+@pytest.mark.asyncio
+async def test_password_hasher_hash_and_verify(workers):
+    hasher = PasswordHasher(workers=workers, queue_size=4, method=FAST_METHOD)
+    try:
+        hashed_password = await hasher.hash("password123")
+
+        assert hashed_password.startswith(FAST_METHOD)
+        assert await hasher.verify(hashed_password, "password123")
+        assert not await hasher.verify(hashed_password, "password321")
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_queue_is_full():
+    hasher = PasswordHasher(workers=1, queue_size=0, method=FAST_METHOD)
+    try:
+        results = await asyncio.gather(
+            hasher.hash("password123"),
+            hasher.hash("password321"),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], str)
+        assert isinstance(results[1], PasswordHasherBusy)
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_keeps_slot_of_cancelled_job():
+    hasher = PasswordHasher(workers=1, queue_size=0, method=FAST_METHOD)
+    try:
+        # warm the pool up so the slow job below starts right away
+        await hasher.hash("password123")
+
+        job = asyncio.ensure_future(hasher._run(time.sleep, 1))
+        await asyncio.sleep(0.2)
+        job.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await job
+
+        # the job is still running in the pool
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.hash("password321")
+
+        for _ in range(50):
+            if hasher._in_flight == 0:
+                break
+            await asyncio.sleep(0.1)
+        assert isinstance(await hasher.hash("password321"), str)
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import LoginAttempt
+from src.database.session import async_session_global
+from src.exceptions import TooManyLoginAttempts
+from src.services.rate_limiter import (
+    InMemoryRateLimitBackend,
+    LoginRateLimiter,
+    PostgresRateLimitBackend,
+)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_limits_attempts():
+    backend = InMemoryRateLimitBackend()
+
+    assert await backend.hit("key", limit=2, window=60)
+    assert await backend.hit("key", limit=2, window=60)
+    assert not await backend.hit("key", limit=2, window=60)
+    assert await backend.hit("other-key", limit=2, window=60)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_window_slides():
+    backend = InMemoryRateLimitBackend()
+    with patch("src.services.rate_limiter.time.monotonic", return_value=100.0):
+        assert await backend.hit("key", limit=1, window=60)
+        assert not await backend.hit("key", limit=1, window=60)
+    with patch("src.services.rate_limiter.time.monotonic", return_value=161.0):
+        assert await backend.hit("key", limit=1, window=60)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_is_bounded():
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    for key in ["key-1", "key-2", "key-3"]:
+        await backend.hit(key, limit=1, window=60)
+
+    assert await backend.hit("key-1", limit=1, window=60)
+
+
+@pytest.mark.asyncio
+async def test_login_rate_limiter_per_account():
+    limiter = LoginRateLimiter(
+        InMemoryRateLimitBackend(), max_per_source=10, max_per_account=1, window=60
+    )
+    await limiter.check("127.0.0.1", "abc@gmail.com")
+
+    with pytest.raises(TooManyLoginAttempts):
+        await limiter.check("10.0.0.1", "ABC@gmail.com")
+    await limiter.check("10.0.0.1", "bzak@agh.pl")
+
+
+@pytest.mark.asyncio
+async def test_login_rate_limiter_per_source():
+    limiter = LoginRateLimiter(
+        InMemoryRateLimitBackend(), max_per_source=1, max_per_account=10, window=60
+    )
+    await limiter.check("127.0.0.1", "abc@gmail.com")
+
+    with pytest.raises(TooManyLoginAttempts):
+        await limiter.check("127.0.0.1", "bzak@agh.pl")
+
+
+@pytest.mark.asyncio
+async def test_postgres_backend_limits_attempts(db_session: AsyncSession):
+    backend = PostgresRateLimitBackend()
+    key = "source:postgres-backend-test"
+    try:
+        assert await backend.hit(key, limit=2, window=60)
+        assert await backend.hit(key, limit=2, window=60)
+        assert not await backend.hit(key, limit=2, window=60)
+    finally:
+        db = async_session_global()
+        await db.execute(delete(LoginAttempt).where(LoginAttempt.key == key))
+        await db.commit()
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_postgres_backend_serializes_concurrent_attempts(
+    db_session: AsyncSession,
+):
+    backend = PostgresRateLimitBackend()
+    key = "source:postgres-backend-concurrency-test"
+    try:
+        allowed = await asyncio.gather(
+            *(backend.hit(key, limit=2, window=60) for _ in range(6))
+        )
+        assert allowed.count(True) == 2
+    finally:
+        db = async_session_global()
+        await db.execute(delete(LoginAttempt).where(LoginAttempt.key == key))
+        await db.commit()
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_postgres_backend_prunes_expired_attempts_of_other_keys(
+    db_session: AsyncSession,
+):
+    backend = PostgresRateLimitBackend()
+    key = "source:postgres-backend-prune-test"
+    stale_key = "source:postgres-backend-stale-test"
+    db = async_session_global()
+    try:
+        await db.execute(
+            insert(LoginAttempt).values(
+                key=stale_key,
+                attempted_at=datetime.now(timezone.utc) - timedelta(hours=1),
+            )
+        )
+        await db.commit()
+
+        assert await backend.hit(key, limit=2, window=60)
+
+        result = await db.execute(
+            select(LoginAttempt.id).where(LoginAttempt.key == stale_key)
+        )
+        assert result.all() == []
+    finally:
+        await db.execute(
+            delete(LoginAttempt).where(LoginAttempt.key.in_([key, stale_key]))
+        )
+        await db.commit()
+        await db.close()
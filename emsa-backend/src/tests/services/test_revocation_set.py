@@ -0,0 +1,50 @@
+import time
+
+from src.services.revocation_set import RevocationSet
+
+
+def test_revocation_set_add_and_check():
+    revoked = RevocationSet(refresh_interval=30)
+    revoked.add("jti-1", time.time() + 60)
+
+    assert revoked.is_revoked("jti-1")
+    assert not revoked.is_revoked("jti-2")
+
+
+def test_revocation_set_drops_expired_tokens():
+    revoked = RevocationSet(refresh_interval=30)
+    revoked.add("jti-1", time.time() - 1)
+    revoked.replace({"jti-2": time.time() + 60, "jti-3": time.time() - 1})
+
+    assert len(revoked) == 1
+    assert not revoked.is_revoked("jti-1")
+    assert revoked.is_revoked("jti-2")
+    assert not revoked.is_revoked("jti-3")
+
+
+def test_revocation_set_keeps_ids_added_after_the_snapshot():
+    revoked = RevocationSet(refresh_interval=30)
+    revoked.add("jti-1", time.time() + 60)
+    read_at = time.monotonic()
+    revoked.add("jti-2", time.time() + 60)
+
+    revoked.replace({"jti-3": time.time() + 60}, read_at)
+
+    assert not revoked.is_revoked("jti-1")
+    assert revoked.is_revoked("jti-2")
+    assert revoked.is_revoked("jti-3")
+
+    # the next snapshot is read after jti-2 was added and must contain it
+    revoked.replace({}, time.monotonic())
+    assert not revoked.is_revoked("jti-2")
+
+
+def test_revocation_set_refresh_interval():
+    revoked = RevocationSet(refresh_interval=30)
+    assert revoked.needs_refresh()
+
+    revoked.replace({})
+
+    assert not revoked.needs_refresh()
+    revoked.clear()
+    assert revoked.needs_refresh()
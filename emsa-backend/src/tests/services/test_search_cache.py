@@ -0,0 +1,81 @@
+from src.services.search_cache import SearchCache
+
+RANKING = [(3, 1.5), (1, 1.0), (2, 0.7)]
+
+
+def test_search_cache_get_and_set():
+    cache = SearchCache(max_size=10, ttl=60)
+    assert cache.get(1, "bike") is None
+
+    cache.set(1, "bike", RANKING)
+
+    assert cache.get(1, "bike") == RANKING
+    assert cache.get(1, "BIKE") == RANKING
+    assert cache.get(2, "bike") is None
+    assert len(cache) == 1
+
+
+def test_search_cache_expires_entries():
+    cache = SearchCache(max_size=10, ttl=0)
+    cache.set(1, "bike", RANKING)
+
+    assert cache.get(1, "bike") is None
+    assert len(cache) == 0
+
+
+def test_search_cache_partial_ranking_serves_shorter_pages():
+    cache = SearchCache(max_size=10, ttl=60)
+    cache.set(1, "bike", RANKING[:2], complete=False)
+
+    assert cache.get(1, "bike", top=2) == RANKING[:2]
+    assert cache.get(1, "bike", top=3) is None
+    assert cache.get(1, "bike") is None
+
+
+def test_search_cache_evicts_least_recently_used():
+    cache = SearchCache(max_size=2, ttl=60)
+    cache.set(1, "bike", RANKING)
+    cache.set(1, "car", RANKING)
+    cache.get(1, "bike")
+    cache.set(2, "bike", RANKING)
+
+    assert cache.get(1, "bike") == RANKING
+    assert cache.get(1, "car") is None
+    assert cache.get(2, "bike") == RANKING
+
+
+def test_search_cache_invalidate_group():
+    cache = SearchCache(max_size=10, ttl=60)
+    cache.set(1, "bike", RANKING)
+    cache.set(1, "car", RANKING)
+    cache.set(2, "bike", RANKING)
+
+    cache.invalidate_group(1)
+
+    assert cache.get(1, "bike") is None
+    assert cache.get(1, "car") is None
+    assert cache.get(2, "bike") == RANKING
+
+
+def test_search_cache_ignores_rankings_older_than_an_invalidation():
+    cache = SearchCache(max_size=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate_group(1)
+
+    cache.set(1, "bike", RANKING, generation=generation)
+
+    assert cache.get(1, "bike") is None
+
+
+def test_search_cache_stats():
+    cache = SearchCache(max_size=10, ttl=60)
+    cache.get(1, "bike")
+    cache.set(1, "bike", RANKING)
+    cache.get(1, "bike")
+    cache.get(1, "bike")
+
+    stats = cache.stats()
+
+    assert stats["size"] == 1
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["hit_ratio"] == 2 / 3
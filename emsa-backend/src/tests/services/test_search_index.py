@@ -0,0 +1,110 @@
+import pytest
+from fuzzywuzzy import fuzz
+
+from src.services.search_index import GroupTagIndex, SearchIndex, ngrams
+
+MEDIA = [
+    (1, ["Bike", "FUNNY", "fall"]),
+    (2, ["FUNNY", "fall"]),
+    (3, ["Travel", "Adventure"]),
+]
+
+
+def build_index() -> GroupTagIndex:
+    index = GroupTagIndex()
+    for media_id, tags in MEDIA:
+        index.add(media_id, tags)
+    return index
+
+
+def test_ngrams_cover_short_terms():
+    assert ngrams("b")
+    assert ngrams("bi") & ngrams("bike")
+
+
+@pytest.mark.parametrize(
+    "term", ["bike", "BIKE", "bi", "funy", "fal", "travel", "adventures", "x", "car"]
+)
+def test_group_tag_index_matches_full_scan(term):
+    index = build_index()
+    expected = {
+        media_id
+        for media_id, tags in MEDIA
+        if any(fuzz.ratio(term.lower(), tag.lower()) / 100 >= 0.65 for tag in tags)
+    }
+
+    assert index.search(term, 0.65) == expected
+
+
+def test_group_tag_index_only_scores_candidates():
+    index = build_index()
+
+    assert index.candidate_tags("bike").isdisjoint({"funny", "fall", "travel"})
+
+
+def test_group_tag_index_remove():
+    index = build_index()
+    index.remove(1)
+
+    assert index.search("bike", 0.65) == set()
+    assert index.search("funny", 0.65) == {2}
+    assert 1 not in index
+    assert len(index) == 2
+
+
+def test_group_tag_index_add_replaces_tags():
+    index = build_index()
+    index.add(1, ["car"])
+
+    assert index.search("bike", 0.65) == set()
+    assert index.search("car", 0.65) == {1}
+    assert index.search("fall", 0.65) == {2}
+
+
+def test_search_index_updates_only_loaded_groups():
+    search_index = SearchIndex(max_size=100, ttl=60)
+    search_index.add_media(1, 10, ["bike"])
+    assert search_index.get(1) is None
+
+    search_index.build(1, MEDIA)
+    search_index.add_media(1, 10, ["bike"])
+    search_index.remove_media(1, 2)
+
+    assert search_index.get(1).search("bike", 0.65) == {1, 10}
+    assert search_index.get(1).search("funny", 0.65) == {1}
+
+
+def test_search_index_evicts_least_recently_used_groups():
+    # every build of MEDIA takes 10 entries
+    search_index = SearchIndex(max_size=25, ttl=60)
+    search_index.build(1, MEDIA)
+    search_index.build(2, MEDIA)
+    search_index.get(1)
+    search_index.build(3, MEDIA)
+
+    assert search_index.get(1) is not None
+    assert search_index.get(2) is None
+    assert search_index.get(3) is not None
+    assert search_index.size == 20
+
+
+def test_search_index_expires_groups():
+    search_index = SearchIndex(max_size=100, ttl=0)
+    search_index.build(1, MEDIA)
+
+    assert search_index.get(1) is None
+    assert len(search_index) == 0
+
+
+def test_search_index_keeps_no_build_older_than_a_write():
+    search_index = SearchIndex(max_size=100, ttl=60)
+    generation = search_index.generation
+    search_index.add_media(1, 10, ["bike"])
+
+    index = search_index.build(1, MEDIA, generation=generation)
+
+    assert index.search("adventure", 0.65) == {3}
+    assert search_index.get(1) is None
+
+    search_index.build(1, MEDIA, generation=search_index.generation)
+    assert search_index.get(1) is not None
@@ -0,0 +1,72 @@
+from src.services.tag_autocomplete import GroupTagPrefixIndex, TagAutocomplete
+
+TAGS = [("bike", 3), ("bikes", 5), ("biking", 1), ("fall", 2), ("funny", 4)]
+
+
+def test_prefix_index_orders_by_usage():
+    index = GroupTagPrefixIndex(TAGS)
+
+    assert index.complete("bik", 10) == [("bikes", 5), ("bike", 3), ("biking", 1)]
+    assert index.complete("bike", 1) == [("bikes", 5)]
+    assert index.complete("f", 10) == [("funny", 4), ("fall", 2)]
+    assert index.complete("", 2) == [("bikes", 5), ("funny", 4)]
+    assert index.complete("car", 10) == []
+
+
+def test_prefix_index_update():
+    index = GroupTagPrefixIndex(TAGS)
+
+    index.update("bicycle", 1)
+    index.update("bikes", -5)
+    index.update("biking", 9)
+
+    assert index.complete("bi", 10) == [("biking", 10), ("bike", 3), ("bicycle", 1)]
+    assert len(index) == 5
+
+
+def test_autocomplete_keeps_groups_up_to_date():
+    autocomplete = TagAutocomplete(max_size=100, ttl=60)
+    assert autocomplete.get(1) is None
+    autocomplete.build(1, TAGS)
+
+    autocomplete.update(1, ["car"], 1)
+    autocomplete.update(2, ["car"], 1)
+
+    assert autocomplete.get(1).complete("c", 10) == [("car", 1)]
+    assert autocomplete.get(2) is None
+    assert autocomplete.size == 6
+
+
+def test_autocomplete_expires_groups():
+    autocomplete = TagAutocomplete(max_size=100, ttl=0)
+    autocomplete.build(1, TAGS)
+
+    assert autocomplete.get(1) is None
+    assert autocomplete.size == 0
+
+
+def test_autocomplete_evicts_least_recently_used():
+    autocomplete = TagAutocomplete(max_size=10, ttl=60)
+    autocomplete.build(1, TAGS)
+    autocomplete.build(2, TAGS)
+    autocomplete.get(1)
+    autocomplete.build(3, TAGS)
+
+    assert autocomplete.get(1) is not None
+    assert autocomplete.get(2) is None
+    assert autocomplete.get(3) is not None
+    assert autocomplete.size == 10
+
+
+def test_autocomplete_keeps_no_build_older_than_a_write():
+    autocomplete = TagAutocomplete(max_size=100, ttl=60)
+    generation = autocomplete.generation
+    autocomplete.update(1, ["car"], 1)
+
+    index = autocomplete.build(1, TAGS, generation=generation)
+
+    assert index.complete("f", 10) == [("funny", 4), ("fall", 2)]
+    assert autocomplete.get(1) is None
+
+    autocomplete.build(1, TAGS, generation=autocomplete.generation)
+    assert autocomplete.get(1) is not None
@@ -1,6 +1,12 @@
 import pytest
 
-from src.services.tag_proposer import propose_tag_from_link, propose_tags_from_name
+from src.services.tag_proposer import (
+    propose_group_tags,
+    propose_tag_from_link,
+    propose_tags,
+    propose_tags_from_name,
+)
+from src.services.tag_stats import GroupTagStats
 
 
 @pytest.mark.parametrize(
@@ -39,3 +45,70 @@ async def test_propose_tag_from_link(link, expected_output):
         f"Link: {link}, Proposed Tag: {proposed_tag}, Expected Output: {expected_output}"
     )
     assert proposed_tag == expected_output
+
+
+GROUP_STATS = GroupTagStats(
+    [
+        ["cat", "funny"],
+        ["cat", "funny", "animals"],
+        ["cat", "animals"],
+        ["cat", "cute"],
+        ["dog", "funny"],
+    ]
+)
+
+
+@pytest.mark.parametrize(
+    "tags, expected_output",
+    [
+        (["cat"], ["funny", "animals"]),
+        (["dog"], ["funny"]),
+        (["cat", "funny"], ["animals", "dog"]),
+        (["cute"], ["cat"]),
+        (["car"], []),
+    ],
+)
+def test_propose_group_tags(tags, expected_output):
+    assert propose_group_tags(tags, GROUP_STATS, min_confidence=0.3) == expected_output
+
+
+def test_propose_group_tags_limit():
+    assert propose_group_tags(["cat"], GROUP_STATS, limit=1, min_confidence=0) == [
+        "funny"
+    ]
+
+
+def test_propose_tags_from_name_with_group_stats():
+    proposed_tags = propose_tags_from_name("My CAT", GROUP_STATS)
+
+    assert proposed_tags[:2] == ["my", "cat"]
+    assert set(proposed_tags[2:]) <= {"funny", "animals", "cute"}
+    assert "funny" in proposed_tags
+
+
+@pytest.mark.parametrize(
+    "name, is_image, link, expected_output",
+    [
+        ("Bike fail", True, "", ["bike", "fail"]),
+        (
+            "Bike fail",
+            False,
+            "https://www.tiktok.com/@user",
+            ["bike", "fail", "tiktok"],
+        ),
+        ("Cat", False, "", ["cat", "funny", "animals"]),
+    ],
+)
+def test_propose_tags(name, is_image, link, expected_output):
+    assert propose_tags(name, is_image, link, GROUP_STATS) == expected_output
+
+
+def test_propose_tags_reuses_parsed_names():
+    first = propose_tags("Old but funny", False, "https://reddit.com/r/memes")
+    first.append("mutated")
+    hits = propose_tag_from_link.cache_info().hits
+
+    second = propose_tags("Old but funny", False, "https://reddit.com/r/memes")
+
+    assert second == ["old", "but", "funny", "reddit"]
+    assert propose_tag_from_link.cache_info().hits == hits + 1
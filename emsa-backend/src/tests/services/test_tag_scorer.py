@@ -0,0 +1,70 @@
+import random
+import string
+
+import pytest
+from fuzzywuzzy import fuzz
+
+from src.services.tag_scorer import TagTable, score_names, score_tags
+from src.settings import settings
+
+
+def random_words(count: int, seed: int = 2137) -> list[str]:
+    generator = random.Random(seed)
+    return [
+        "".join(generator.choices("abcdeiklnorsty", k=generator.randint(1, 9)))
+        for _ in range(count)
+    ]
+
+
+def test_score_tags_matches_fuzzywuzzy():
+    vocabulary = random_words(500)
+    for term in ["bike", "fal", "a", "travel"]:
+        expected = [fuzz.ratio(term, tag) for tag in vocabulary]
+
+        assert score_tags(term, vocabulary).tolist() == expected
+
+
+def test_score_tags_in_parallel(monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_SEARCH_PARALLEL_MIN_TAGS", 1)
+    monkeypatch.setattr(settings, "MEDIA_SEARCH_WORKERS", 2)
+    vocabulary = random_words(2000)
+
+    assert score_tags("kite", vocabulary).tolist() == [
+        fuzz.ratio("kite", tag) for tag in vocabulary
+    ]
+
+
+def test_score_empty_vocabulary():
+    assert score_tags("bike", []).tolist() == []
+    assert score_names("bike", []).tolist() == []
+
+
+def test_score_names():
+    scores = score_names("Bike", ["My bike ride", "", "car"])
+
+    assert scores.tolist()[:2] == [1.0, 0.0]
+    assert scores[2] < 0.65
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.65, 0.9])
+def test_tag_table_matches_full_scan(threshold):
+    media_tags = [random_words(3, seed) for seed in range(300)] + [[]]
+    table = TagTable(media_tags)
+    for term in random_words(20, seed=7) + [string.ascii_lowercase]:
+        expected = [
+            position
+            for position, tags in enumerate(media_tags)
+            if any(fuzz.ratio(term, tag.lower()) / 100 >= threshold for tag in tags)
+        ]
+
+        best_scores = table.best_scores(term)
+        assert [
+            position for position, score in enumerate(best_scores) if score >= threshold
+        ] == expected
+
+
+def test_tag_table_scores_each_tag_once():
+    table = TagTable([["Bike", "fun"], ["bike", "FUN"], ["car"]])
+
+    assert table.vocabulary == ["bike", "fun", "car"]
+    assert table.best_scores("BIKE").tolist() == [1.0, 1.0, 0.0]
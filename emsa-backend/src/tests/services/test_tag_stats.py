@@ -0,0 +1,82 @@
+from src.services.tag_stats import GroupTagStats, TagStatsCache
+
+MEDIA_TAGS = [
+    ["cat", "funny"],
+    ["cat", "funny", "animals"],
+    ["cat", "animals"],
+    ["cat", "cute"],
+    ["dog", "funny"],
+]
+
+
+def test_group_tag_stats_counts():
+    stats = GroupTagStats(MEDIA_TAGS)
+
+    assert stats.frequency["cat"] == 4
+    assert stats.cooccurrence["cat"]["funny"] == 2
+    assert stats.related("cat") == [("animals", 0.5), ("funny", 0.5), ("cute", 0.25)]
+    assert stats.related("car") == []
+    assert "cat" in stats and "car" not in stats
+
+
+def test_group_tag_stats_updates():
+    stats = GroupTagStats(MEDIA_TAGS)
+    assert stats.related("dog") == [("funny", 1.0)]
+
+    stats.add(["dog", "cute"])
+    stats.remove(["cat", "cute"])
+
+    assert stats.related("dog") == [("cute", 0.5), ("funny", 0.5)]
+    assert stats.related("cute") == [("dog", 1.0)]
+    assert (
+        stats.size
+        == GroupTagStats(MEDIA_TAGS[:3] + MEDIA_TAGS[4:] + [["dog", "cute"]]).size
+    )
+
+
+def test_group_tag_stats_remove_everything():
+    stats = GroupTagStats(MEDIA_TAGS)
+    for tags in MEDIA_TAGS:
+        stats.remove(tags)
+
+    assert not stats.frequency
+    assert not stats.cooccurrence
+    assert stats.size == 0
+
+
+def test_tag_stats_cache_keeps_groups_up_to_date():
+    cache = TagStatsCache(max_size=100, ttl=60)
+    cache.build(1, MEDIA_TAGS)
+
+    cache.add_media(1, ["cat", "dog"])
+    cache.add_media(2, ["cat", "dog"])
+
+    assert cache.get(1).cooccurrence["dog"]["cat"] == 1
+    assert cache.get(2) is None
+    assert cache.size == cache.get(1).size
+
+
+def test_tag_stats_cache_expires_and_evicts():
+    expiring = TagStatsCache(max_size=100, ttl=0)
+    expiring.build(1, MEDIA_TAGS)
+    assert expiring.get(1) is None
+
+    cache = TagStatsCache(max_size=GroupTagStats(MEDIA_TAGS).size, ttl=60)
+    cache.build(1, MEDIA_TAGS)
+    cache.build(2, MEDIA_TAGS)
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+
+
+def test_tag_stats_cache_keeps_no_build_older_than_a_write():
+    cache = TagStatsCache(max_size=100, ttl=60)
+    generation = cache.generation
+    cache.add_media(1, ["cat", "dog"])
+
+    stats = cache.build(1, MEDIA_TAGS, generation=generation)
+
+    assert stats.frequency["cat"] == 4
+    assert cache.get(1) is None
+
+    cache.build(1, MEDIA_TAGS, generation=cache.generation)
+    assert cache.get(1) is not None
@@ -0,0 +1,92 @@
+import time
+
+from src.database.schemas import PrivateUser
+from src.services.token_cache import TokenCache, hash_token
+
+USER = PrivateUser(mail="abc@gmail.com", name="Dominik", password_hash="321fdas532")
+OTHER_USER = PrivateUser(mail="bzak@agh.pl", name="Bartosz", password_hash="emsa2137")
+
+
+def test_hash_token_is_stable():
+    assert hash_token("token") == hash_token("token")
+    assert hash_token("token") != hash_token("other-token")
+
+
+def test_token_cache_get_and_set():
+    cache = TokenCache(max_size=10, ttl=60)
+    assert cache.get("token") is None
+
+    cache.set("token", USER)
+
+    assert cache.get("token") == USER
+    assert len(cache) == 1
+
+
+def test_token_cache_respects_token_expiry():
+    cache = TokenCache(max_size=10, ttl=60)
+    cache.set("token", USER, token_expires_at=time.time() - 1)
+
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(max_size=2, ttl=60)
+    cache.set("token-1", USER)
+    cache.set("token-2", OTHER_USER)
+    cache.get("token-1")
+    cache.set("token-3", USER)
+
+    assert cache.get("token-1") == USER
+    assert cache.get("token-2") is None
+    assert cache.get("token-3") == USER
+
+
+def test_token_cache_invalidate_user():
+    cache = TokenCache(max_size=10, ttl=60)
+    cache.set("token-1", USER)
+    cache.set("token-2", USER)
+    cache.set("token-3", OTHER_USER)
+
+    cache.invalidate_user(USER.mail)
+
+    assert cache.get("token-1") is None
+    assert cache.get("token-2") is None
+    assert cache.get("token-3") == OTHER_USER
+
+
+def test_token_cache_skips_set_after_invalidation():
+    cache = TokenCache(max_size=10, ttl=60)
+    generation = cache.generation(USER.mail)
+    cache.invalidate_user(USER.mail)
+
+    cache.set("token", USER, generation=generation)
+
+    assert cache.get("token") is None
+
+
+def test_token_cache_invalidation_is_per_user():
+    cache = TokenCache(max_size=10, ttl=60)
+    generation = cache.generation(OTHER_USER.mail)
+    cache.invalidate_user(USER.mail)
+
+    cache.set("token", OTHER_USER, generation=generation)
+
+    assert cache.get("token") == OTHER_USER
+
+
+def test_token_cache_skips_set_after_clear():
+    cache = TokenCache(max_size=10, ttl=60)
+    generation = cache.generation(USER.mail)
+    cache.clear()
+
+    cache.set("token", USER, generation=generation)
+
+    assert cache.get("token") is None
+
+
+def test_token_cache_disabled():
+    cache = TokenCache(max_size=0, ttl=60)
+    cache.set("token", USER)
+
+    assert cache.get("token") is None
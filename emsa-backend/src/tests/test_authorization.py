@@ -4,6 +4,7 @@ import pytest
 import pytest_asyncio
 from fastapi import HTTPException, status
 from jose import jwt
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.authorization import (
@@ -15,8 +16,11 @@ from src.authorization import (
     verify_password,
 )
 from src.crud.user import UserCRUD
+from src.database.models import Token
 from src.database.schemas import PrivateUser
 from src.exceptions import IncorrectUsernameOrPassword
+from src.services.revocation_set import revocation_set
+from src.services.token_cache import token_cache
 from src.settings import settings
 
 
@@ -106,3 +110,95 @@ async def test_get_current_user_failure(
     with pytest.raises(HTTPException) as exc_info:
         await get_current_user(access_token, db_session)
     assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_is_cached(
+    db_session: AsyncSession, mock_user: PrivateUser
+):
+    access_token = await create_access_token(
+        data={"sub": mock_user.mail}, db=db_session
+    )
+    await get_current_user(access_token, db_session)
+    assert token_cache.get(access_token) == mock_user
+
+    await UserCRUD.deactivate_token(mock_user, db_session)
+
+    assert token_cache.get(access_token) is None
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(access_token, db_session)
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_unknown_mail(db_session: AsyncSession):
+    with pytest.raises(IncorrectUsernameOrPassword):
+        await authenticate_user("unknown@example.com", "password123", db_session)
+
+
+@pytest.mark.asyncio
+async def test_token_cache_is_invalidated_again_after_commit(
+    db_session: AsyncSession, mock_user: PrivateUser
+):
+    access_token = await create_access_token(
+        data={"sub": mock_user.mail}, db=db_session
+    )
+    await UserCRUD.deactivate_token(mock_user, db_session)
+    # a concurrent request still reading the committed, active token
+    token_cache.set(access_token, mock_user)
+
+    await db_session.commit()
+
+    assert token_cache.get(access_token) is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_stateless_skips_token_lookup(
+    db_session: AsyncSession, mock_user: PrivateUser, monkeypatch
+):
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    access_token = await create_access_token(
+        data={"sub": mock_user.mail}, db=db_session
+    )
+    assert "jti" in decode_jwt_token(access_token)
+    await db_session.execute(delete(Token))
+
+    user = await get_current_user(access_token, db_session)
+
+    assert user == mock_user
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_stateless_rejects_revoked_token(
+    db_session: AsyncSession, mock_user: PrivateUser, monkeypatch
+):
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    access_token = await create_access_token(
+        data={"sub": mock_user.mail}, db=db_session
+    )
+    await get_current_user(access_token, db_session)
+
+    await UserCRUD.deactivate_token(mock_user, db_session)
+    # the local set only follows committed revocations
+    assert not revocation_set.is_revoked(decode_jwt_token(access_token)["jti"])
+    await db_session.commit()
+
+    jti = decode_jwt_token(access_token)["jti"]
+    assert jti in await UserCRUD.get_revoked_tokens(db_session)
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(access_token, db_session)
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_stateless_requires_jti(
+    db_session: AsyncSession, mock_user: PrivateUser, monkeypatch
+):
+    access_token = await create_access_token(
+        data={"sub": mock_user.mail}, db=db_session
+    )
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(access_token, db_session)
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED